@@ -0,0 +1,3 @@
+SKILLS_MODEL_PATH = "data/analytics/skills.pkl"  # Matrices de co-ocurrencia persistidas
+MIN_SUPPORT = 3  # Trabajos mínimos para reportar un par o una asociación
+GROUP_DIMENSIONS = ["nivel_puesto", "empresa"]  # Columnas de principal cruzadas con las tecnologías
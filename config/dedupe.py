@@ -0,0 +1,6 @@
+DEDUPE_INDEX_PATH = "data/dedupe/lsh_index.pkl"
+NUM_PERM = 128  # Permutaciones de MinHash por firma
+LSH_BANDS = 16  # 16 bandas x 8 filas: candidatos a partir de ~0.7 de similitud
+SIMILARITY_THRESHOLD = 0.85  # Jaccard estimado mínimo para reutilizar un análisis
+SHINGLE_SIZE = 3  # Palabras por shingle
+SEED = 42  # Fija las permutaciones para que las firmas persistidas sigan siendo válidas
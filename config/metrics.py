@@ -0,0 +1,7 @@
+import os
+
+METRICS_DIR = "data/metrics"
+# Un archivo por punto de entrada (main, warehouse) para el textfile collector de node_exporter
+PROMETHEUS_TEXTFILE = os.path.join(METRICS_DIR, "etl_{job}.prom")
+TRACE_LOG = os.path.join(METRICS_DIR, "traces.jsonl")  # Un span por línea
+METRICS_PORT = int(os.getenv("ETL_METRICS_PORT", "0"))  # 0 = sin endpoint HTTP
@@ -0,0 +1,6 @@
+import os
+
+PROFILES_DIR = "data/profiles"
+PROFILE_MODES = os.getenv("ETL_PROFILE", "")  # Combinación de cpu, mem, sample separada por comas
+PROFILE_TOP_N = int(os.getenv("ETL_PROFILE_TOP_N", "30"))  # Entradas en los reportes de texto
+SAMPLE_INTERVAL = float(os.getenv("ETL_PROFILE_SAMPLE_INTERVAL", "0.01"))  # Segundos entre muestras
@@ -6,4 +6,6 @@ PROXY_SERVERS = [
 ROTATION_INTERVAL = 10  # Rotate after every 10 requests
 REQUEST_DELAY = 5  # Seconds between requests
 MAX_RETRIES = 3  # Max retries for failed requests
-TIMEOUT = 30000  # Milliseconds for page operations
\ No newline at end of file
+TIMEOUT = 30000  # Milliseconds for page operations
+READY_TIMEOUT = 8000  # Milisegundos para navegar y que la publicación muestre su contenido o un bloqueo
+DESCRIPTION_TIMEOUT = 3000  # Milisegundos extra para la descripción una vez lista la página
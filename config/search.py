@@ -0,0 +1,2 @@
+SEARCH_DB_PATH = "data/search/jobs.db"  # Índice SQLite FTS5 de las descripciones
+SEARCH_LIMIT = 50  # Resultados por consulta por defecto
@@ -0,0 +1,2 @@
+DETAILS_STORE_DIR = "data/job_details/segments"  # Log segmentado de detalles analizados
+MAX_SEGMENT_BYTES = 64 * 1024 * 1024  # Tamaño a partir del cual se abre un segmento nuevo
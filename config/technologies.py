@@ -0,0 +1,51 @@
+# Nombre canónico -> alias conocidos. El orden define el ID canónico (1, 2, ...),
+# así que las tecnologías nuevas deben agregarse al final.
+TECHNOLOGY_ALIASES = {
+    "AWS": ["amazon web services", "aws cloud", "amazon aws", "aws cloud services"],
+    "Azure": ["microsoft azure", "azure cloud", "ms azure"],
+    "Google Cloud": ["gcp", "google cloud platform", "google cloud services"],
+    "Python": ["python3", "python 3", "lenguaje python", "programacion en python"],
+    "SQL": ["lenguaje sql", "sql avanzado", "t-sql", "tsql", "pl/sql", "plsql"],
+    "Apache Spark": ["spark", "spark sql", "spark streaming"],
+    "PySpark": ["py spark"],
+    "Databricks": ["azure databricks", "databricks lakehouse"],
+    "Snowflake": ["snowflake data cloud"],
+    "Apache Airflow": ["airflow", "mwaa", "cloud composer"],
+    "dbt": ["data build tool", "dbt core", "dbt cloud"],
+    "Apache Kafka": ["kafka", "confluent kafka"],
+    "Hadoop": ["apache hadoop", "hdfs"],
+    "Hive": ["apache hive"],
+    "Docker": ["contenedores docker"],
+    "Kubernetes": ["k8s", "eks", "aks", "gke"],
+    "Terraform": ["hashicorp terraform"],
+    "Git": ["github", "gitlab", "bitbucket", "control de versiones git"],
+    "CI/CD": ["ci cd", "integracion continua", "github actions", "jenkins", "azure devops"],
+    "Linux": ["unix", "bash", "shell scripting"],
+    "Power BI": ["powerbi", "microsoft power bi", "power bi desktop"],
+    "Tableau": ["tableau desktop", "tableau server"],
+    "Looker": ["looker studio", "google data studio", "data studio"],
+    "Excel": ["microsoft excel", "ms excel", "excel avanzado"],
+    "Java": ["java 8", "java 11", "java 17"],
+    "Scala": ["lenguaje scala"],
+    "R": ["lenguaje r", "r programming", "rstudio"],
+    "Pandas": ["python pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": ["tensor flow", "keras"],
+    "PyTorch": ["torch"],
+    "PostgreSQL": ["postgres", "postgresql database"],
+    "MySQL": ["my sql"],
+    "SQL Server": ["microsoft sql server", "ms sql server", "mssql", "sql server management studio"],
+    "Oracle": ["oracle database", "oracle db"],
+    "MongoDB": ["mongo", "mongo db"],
+    "Amazon Redshift": ["redshift", "aws redshift"],
+    "BigQuery": ["google bigquery", "big query", "gcp bigquery"],
+    "AWS Glue": ["glue", "aws glue etl"],
+    "Azure Data Factory": ["adf", "data factory"],
+    "Informatica": ["informatica powercenter", "powercenter"],
+    "SSIS": ["sql server integration services"],
+    "Inglés": ["ingles", "english", "idioma ingles", "ingles avanzado", "ingles intermedio"],
+    "Español": ["espanol", "spanish", "castellano"],
+}
+
+FUZZY_CUTOFF = 0.88  # Similitud mínima (difflib) para aceptar una tecnología desconocida como alias
@@ -0,0 +1,2 @@
+TREND_CUBE_PATH = "data/analytics/trend_cube.npz"  # Conteos semanales precalculados
+TREND_WEEKS = 52  # Semanas que muestra por defecto el dashboard
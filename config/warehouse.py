@@ -0,0 +1 @@
+CHUNK_ROWS = 50000  # Filas por tabla que se mantienen en memoria antes de volcarlas a disco
@@ -0,0 +1,6 @@
+import os
+
+WORKER_COUNT = int(os.getenv("ETL_WORKERS", str(os.cpu_count() or 1)))  # Procesos, cada uno con su navegador
+PAGES_PER_WORKER = int(os.getenv("ETL_PAGES_PER_WORKER", "2"))  # Páginas concurrentes por navegador
+MAX_WORKER_RESTARTS = 3  # Reinicios permitidos por worker caído
+WORKER_HEADLESS = True
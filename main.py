@@ -1,23 +1,26 @@
-import pandas as pd
-from scraping.scraper import scrape_job_details, process_job
-from scraping.job_search import JobSearch
-from transformación.transform import transform_data, save_to_parquet, save_to_json
-from config.search_params import COUNTRIES
+# Las dependencias pesadas (pandas, Playwright, LLM) se importan dentro de cada modo
+# para que el menú y las ejecuciones cortas no paguen su costo de arranque
+from monitoreo.metrics import span, start_http_server, write_prometheus_textfile
+from monitoreo.profiling import profiled, profile_run, set_profile_modes
 from datetime import datetime
+import argparse
 import json
 import os
 import asyncio
 
+@profiled("main_busqueda")
 async def run_job_search(job_title: str, countries: list):
     """Ejecuta la búsqueda de trabajos y guarda los resultados como JSON"""
+    import pandas as pd
+    from scraping.job_search import JobSearch
     
     # Inicializar el scraper
-    scraper = JobSearch()
-    await scraper.__ainit__(headless=False)
+    scraper = await JobSearch.create(headless=False)
     
     # Ejecutar el scraping
     print(f"Iniciando búsqueda para: {job_title}")
-    results = await scraper.scrape_jobs(job_title, countries)
+    with span("job_search", job_title=job_title, countries=countries):
+        results = await scraper.scrape_jobs(job_title, countries)
     
     # Convertir a DataFrame
     df = pd.DataFrame(results)
@@ -32,48 +35,109 @@ async def run_job_search(job_title: str, countries: list):
     print(f"Resultados guardados en: {filepath}")
     print(f"Total de trabajos encontrados: {len(df)}")
 
+@profiled("main_busqueda_paralela")
+def run_parallel_job_search(job_titles: list, countries: list):
+    """Reparte cada (título, país) entre los workers del pool y escribe los resultados a medida que llegan"""
+    from scraping.worker_pool import WorkerPool, search_task
+
+    tasks = [search_task(title, country) for title in job_titles for country in countries]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filepath = os.path.join("data/job_searchs", f"jobs_{timestamp}.json")
+    os.makedirs("data/job_searchs", exist_ok=True)
+
+    total = 0
+    with span("job_search_pool", job_titles=job_titles, countries=countries):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write("[")
+            for result in WorkerPool().run(tasks):
+                task = result["task"]
+                if not result["ok"]:
+                    print(f"❌ {task['job_title']} ({task['country']}): {result['error']}")
+                    continue
+                print(f"✅ {task['job_title']} ({task['country']}): {len(result['result'])} trabajos")
+                for job in result["result"]:
+                    f.write("\n  " if total == 0 else ",\n  ")
+                    f.write(json.dumps(job, ensure_ascii=False))
+                    total += 1
+            f.write("\n]\n")
+
+    print(f"Resultados guardados en: {filepath}")
+    print(f"Total de trabajos encontrados: {total}")
+
+@profiled("main_historico_paralelo")
+def run_parallel_historical(jobs: list):
+    """Procesa publicaciones de una búsqueda histórica en el pool de procesos"""
+    from scraping.worker_pool import WorkerPool, job_task
+
+    results = []
+    for result in WorkerPool().run(job_task(job) for job in jobs):
+        job = result["task"]["job"]
+        if result["ok"] and result["result"]:
+            print(f"✅ {job.get('title')} - {job.get('company')}: {result['result']['output_file']}")
+            results.append(result["result"])
+        else:
+            print(f"❌ {job.get('title')} - {job.get('company')}: {result.get('error', 'sin resultados')}")
+    return results
+
+def seleccionar_paises():
+    """Pregunta por los países de la búsqueda"""
+    print("\nSelecciona el país para la búsqueda:")
+    print("1. Perú")
+    print("2. Estados Unidos")
+    print("3. Ambos")
+    
+    country_choice = input("Ingresa tu elección (1, 2 o 3): ")
+    
+    if country_choice == "1":
+        return ["PE"]
+    elif country_choice == "2":
+        return ["US"]
+    elif country_choice == "3":
+        return ["PE", "US"]
+    print("Opción no válida, se usará Perú por defecto")
+    return ["PE"]
+
 async def scrape_single_job():
     """Extrae y procesa un solo trabajo"""
+    from scraping.scraper import process_job
+
     try:
         job_data = {}
         job_data['link'] = input("Por favor ingresa la URL del trabajo: ")
         
         # Procesar el trabajo usando la función helper
-        result = await process_job(job_data)
+        with profile_run("main_trabajo"):
+            result = await process_job(job_data)
             
     except Exception as e:
         print(f"Error durante el proceso: {str(e)}")
         raise
 
 async def main():
+    start_http_server()
+    try:
+        await run_menu()
+    finally:
+        write_prometheus_textfile("main")
+
+async def run_menu():
     print("Selecciona el modo de operación:")
     print("1. Búsqueda masiva de trabajos")
     print("2. Análisis de un trabajo específico")
     print("3. Procesar búsqueda histórica")
+    print("4. Búsqueda masiva en paralelo (pool de procesos)")
     
-    choice = input("Ingresa tu elección (1, 2 o 3): ")
+    choice = input("Ingresa tu elección (1, 2, 3 o 4): ")
     
     if choice == "1":
         job_title = input("Ingresa el título del trabajo a buscar: ")
-        
-        print("\nSelecciona el país para la búsqueda:")
-        print("1. Perú")
-        print("2. Estados Unidos")
-        print("3. Ambos")
-        
-        country_choice = input("Ingresa tu elección (1, 2 o 3): ")
-        
-        if country_choice == "1":
-            countries = ["PE"]
-        elif country_choice == "2":
-            countries = ["US"]
-        elif country_choice == "3":
-            countries = ["PE", "US"]
-        else:
-            print("Opción no válida, se usará Perú por defecto")
-            countries = ["PE"]
-        
+        countries = seleccionar_paises()
         await run_job_search(job_title, countries)
+    elif choice == "4":
+        job_titles = input("Ingresa los títulos a buscar separados por comas: ")
+        job_titles = [t.strip() for t in job_titles.split(",") if t.strip()]
+        countries = seleccionar_paises()
+        run_parallel_job_search(job_titles, countries)
     elif choice == "2":
         await scrape_single_job()
     elif choice == "3":
@@ -142,8 +206,14 @@ async def main():
         num_jobs = int(input("Cuantos registros se va a procesar: ")) 
         
         # Procesar la búsqueda seleccionada
-        job_search = await JobSearch.create()
-        results = await job_search.process_historical_search(selected_file, num_jobs, start_index=inicio_proceso)
+        paralelo = input("¿Procesar en paralelo con el pool de procesos? (s/n): ")
+        if paralelo.lower() == 's':
+            results = run_parallel_historical(registros[inicio_proceso:inicio_proceso + num_jobs])
+        else:
+            with profile_run("main_historico"):
+                from scraping.job_search import JobSearch
+                job_search = await JobSearch.create()
+                results = await job_search.process_historical_search(selected_file, num_jobs, start_index=inicio_proceso)
         
         if results:
             print("\nResultados procesados:")
@@ -151,5 +221,9 @@ async def main():
         print("Opción no válida")
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ETL de ofertas laborales")
+    parser.add_argument("--profile", help="Modos de perfilado separados por comas: cpu, mem, sample")
+    args = parser.parse_args()
+    if args.profile:
+        set_profile_modes(args.profile)
+    asyncio.run(main())
@@ -0,0 +1 @@
+# Archivo __init__.py para convertir el directorio en paquete Python
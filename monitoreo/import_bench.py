@@ -0,0 +1,68 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Módulos de entrada cuyo tiempo de importación queremos vigilar
+DEFAULT_MODULES = [
+    "main",
+    "scraping",
+    "transformación.transform",
+    "transformación.datawarehouse",
+]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _importtime(module: str):
+    """Importa el módulo en un intérprete limpio y devuelve (segundos, top de imports, error)"""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    imports = []
+    error = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:"):].split("|", 2)
+            if cumulative.strip().isdigit():
+                imports.append((int(cumulative), name.strip()))
+        elif line.strip():
+            error = line.strip()
+    if proc.returncode == 0:
+        error = None
+    return elapsed, sorted(imports, reverse=True), error
+
+
+def benchmark(modules, repeat: int = 5, top: int = 10):
+    """Mide el tiempo de importación en frío de cada módulo"""
+    for module in modules:
+        timings = []
+        heaviest = []
+        error = None
+        for _ in range(repeat):
+            elapsed, imports, error = _importtime(module)
+            timings.append(elapsed)
+            heaviest = imports
+        print(f"\n📦 {module}: mediana {statistics.median(timings) * 1000:.1f} ms "
+              f"(min {min(timings) * 1000:.1f} ms, {repeat} repeticiones)")
+        if error:
+            print(f"   ⚠️  Error al importar: {error}")
+        for cumulative_us, name in heaviest[:top]:
+            print(f"   {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de tiempo de importación")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    benchmark(args.modules, args.repeat, args.top)
@@ -0,0 +1,255 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from config.metrics import PROMETHEUS_TEXTFILE, TRACE_LOG, METRICS_PORT
+
+# Buckets en segundos, pensados para cargas de página y llamadas al LLM
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _check_labels(metric, key):
+    """Una familia de métricas lleva siempre las mismas etiquetas, o Prometheus no puede agregarla"""
+    names = tuple(k for k, _ in key)
+    if metric._label_names is None:
+        metric._label_names = names
+    elif names != metric._label_names:
+        raise ValueError(f"{metric.name} usa las etiquetas {metric._label_names}, no {names}")
+
+
+def _format_labels(key, extra=None) -> str:
+    pairs = list(key) + (extra or [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(34), chr(39))}"' for k, v in pairs)
+    return "{" + body + "}"
+
+
+class Counter:
+    """Contador monótono con etiquetas opcionales"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._label_names = None
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        _check_labels(self, key)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def drain(self) -> Dict:
+        """Devuelve lo acumulado desde el último drain y lo pone en cero"""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict):
+        with self._lock:
+            for key, amount in values.items():
+                self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histograma acumulativo al estilo Prometheus"""
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._label_names = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        _check_labels(self, key)
+        with self._lock:
+            series = self._series.setdefault(
+                key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def drain(self) -> Dict:
+        """Devuelve lo acumulado desde el último drain y lo pone en cero"""
+        with self._lock:
+            series, self._series = self._series, {}
+        return series
+
+    def merge(self, series: Dict):
+        with self._lock:
+            for key, other in series.items():
+                current = self._series.setdefault(
+                    key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                )
+                current["counts"] = [a + b for a, b in zip(current["counts"], other["counts"])]
+                current["sum"] += other["sum"]
+                current["count"] += other["count"]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Registry:
+    """Registro de métricas del proceso"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def histogram(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def drain(self) -> Dict[str, Dict]:
+        """Deltas de todas las métricas desde el último drain, para enviarlas a otro proceso"""
+        deltas = {name: metric.drain() for name, metric in self._metrics.items()}
+        return {name: delta for name, delta in deltas.items() if delta}
+
+    def merge(self, deltas: Dict[str, Dict]):
+        """Suma los deltas de otro proceso (p. ej. un worker del pool) a este registro"""
+        for name, delta in deltas.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(delta)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# Métricas compartidas por todas las etapas del ETL
+PAGES_SCRAPED = REGISTRY.counter("etl_pages_scraped_total", "Páginas de LinkedIn procesadas")
+SEARCH_PAGES = REGISTRY.counter("etl_search_pages_total", "Páginas de resultados de búsqueda por país")
+RETRIES = REGISTRY.counter("etl_retries_total", "Reintentos de scraping")
+CACHE_HITS = REGISTRY.counter("etl_cache_hits_total", "Análisis reutilizados sin llamar al LLM")
+LLM_TOKENS = REGISTRY.counter("etl_llm_tokens_total", "Tokens consumidos por el LLM")
+FAILURES = REGISTRY.counter("etl_failures_total", "Fallos por etapa")
+LLM_FAILURES = REGISTRY.counter("etl_llm_failures_total", "Llamadas al LLM fallidas por modelo")
+PAGE_OUTCOMES = REGISTRY.counter("etl_page_outcomes_total", "Resultado de la carga de páginas (ok, blocked, expired, timeout)")
+STAGE_SECONDS = REGISTRY.histogram("etl_stage_seconds", "Duración de cada etapa")
+PAGE_LOAD_SECONDS = REGISTRY.histogram("etl_page_load_seconds", "Tiempo de carga de páginas")
+LLM_LATENCY_SECONDS = REGISTRY.histogram("etl_llm_latency_seconds", "Latencia de las llamadas al LLM")
+
+
+def _write_trace(record: Dict):
+    os.makedirs(os.path.dirname(TRACE_LOG), exist_ok=True)
+    with open(TRACE_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Mide una etapa, la registra en STAGE_SECONDS y escribe el span en el trace log"""
+    parent = _current_span.get()
+    current = {
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "stage": stage,
+    }
+    token = _current_span.set(current)
+    started_at = datetime.now().isoformat()
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield current
+    except Exception as e:
+        status = "error"
+        attrs["error"] = str(e)
+        FAILURES.inc(stage=stage)
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        _current_span.reset(token)
+        STAGE_SECONDS.observe(duration, stage=stage)
+        _write_trace({
+            **current,
+            "start": started_at,
+            "duration_s": round(duration, 6),
+            "status": status,
+            "attrs": attrs,
+        })
+
+
+def write_prometheus_textfile(job: str, path: Optional[str] = None) -> str:
+    """Escribe todas las métricas en formato texto de Prometheus de forma atómica
+
+    Cada punto de entrada usa su propio `job`, así un proceso no borra las
+    métricas que escribió otro.
+    """
+    path = path or PROMETHEUS_TEXTFILE.format(job=job)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp_path, path)
+    return path
+
+
+def start_http_server(port: Optional[int] = None):
+    """Expone /metrics en un hilo de fondo si hay un puerto configurado"""
+    port = METRICS_PORT if port is None else port
+    if not port:
+        return None
+    # http.server solo se importa si el endpoint está habilitado
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📈 Métricas disponibles en http://0.0.0.0:{port}/metrics")
+    return server
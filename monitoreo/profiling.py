@@ -0,0 +1,151 @@
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Optional
+
+from config.profiling import PROFILES_DIR, PROFILE_MODES, PROFILE_TOP_N, SAMPLE_INTERVAL
+
+VALID_MODES = {"cpu", "mem", "sample"}
+
+_active_modes = set()
+
+
+def set_profile_modes(modes):
+    """Activa los modos de perfilado (cpu, mem, sample) desde una lista o texto separado por comas"""
+    global _active_modes
+    if isinstance(modes, str):
+        modes = modes.split(",")
+    modes = {m.strip().lower() for m in modes or [] if m.strip()}
+    unknown = modes - VALID_MODES
+    if unknown:
+        raise ValueError(f"Modos de perfilado no válidos: {', '.join(sorted(unknown))}")
+    _active_modes = modes
+
+
+def active_modes():
+    return set(_active_modes)
+
+
+class _StackSampler(threading.Thread):
+    """Muestrea periódicamente la pila de un hilo y acumula stacks colapsados"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _run_dir(name: str) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(PROFILES_DIR, f"{name}_{timestamp}_{os.getpid()}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@contextmanager
+def profile_run(name: str, modes: Optional[Iterable[str]] = None):
+    """Perfila el bloque con los modos activos y escribe los resultados en data/profiles/<name>_<timestamp>"""
+    modes = set(modes) if modes is not None else active_modes()
+    if not modes:
+        yield None
+        return
+
+    run_dir = _run_dir(name)
+    profiler = cProfile.Profile() if "cpu" in modes else None
+    sampler = _StackSampler(threading.get_ident(), SAMPLE_INTERVAL) if "sample" in modes else None
+    started_tracemalloc = False
+    mem_before = None
+
+    if "mem" in modes:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            started_tracemalloc = True
+        mem_before = tracemalloc.take_snapshot()
+    if sampler:
+        sampler.start()
+    if profiler:
+        profiler.enable()
+
+    start = time.perf_counter()
+    try:
+        yield run_dir
+    finally:
+        if profiler:
+            profiler.disable()
+        if sampler:
+            sampler.stop()
+        elapsed = time.perf_counter() - start
+
+        if profiler:
+            profiler.dump_stats(os.path.join(run_dir, "cpu.prof"))
+            with open(os.path.join(run_dir, "cpu.txt"), "w", encoding="utf-8") as f:
+                stats = pstats.Stats(profiler, stream=f)
+                stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+
+        if mem_before is not None:
+            mem_after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            with open(os.path.join(run_dir, "memory.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Memoria actual: {current / 1024 / 1024:.1f} MiB, pico: {peak / 1024 / 1024:.1f} MiB\n\n")
+                f.write(f"Top {PROFILE_TOP_N} diferencias de asignación:\n")
+                for stat in mem_after.compare_to(mem_before, "lineno")[:PROFILE_TOP_N]:
+                    f.write(f"{stat}\n")
+
+        if sampler:
+            # Formato de stacks colapsados compatible con flamegraph.pl / speedscope
+            with open(os.path.join(run_dir, "samples.folded"), "w", encoding="utf-8") as f:
+                for stack, count in sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        print(f"🔬 Perfil de '{name}' ({elapsed:.2f}s) guardado en: {run_dir}")
+
+
+def profiled(name: Optional[str] = None):
+    """Decorador equivalente a `profile_run` para funciones síncronas o asíncronas"""
+    def decorator(func):
+        run_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with profile_run(run_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_run(run_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+set_profile_modes(PROFILE_MODES)
@@ -1,4 +1,11 @@
 # scraping/__init__.py
-from .scraper import scrape_job_details
+# Playwright y el cliente del LLM se cargan solo al acceder a los atributos del paquete
 
-__all__ = ['scrape_job_details']
\ No newline at end of file
+__all__ = ['scrape_job_details']
+
+
+def __getattr__(name):
+    if name == 'scrape_job_details':
+        from .scraper import scrape_job_details
+        return scrape_job_details
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,8 @@ from playwright.async_api import async_playwright
 from config.search_params import COUNTRIES
 from config.proxies import PROXY_SERVERS, ROTATION_INTERVAL, REQUEST_DELAY, MAX_RETRIES, TIMEOUT
 from scraping.scraper import process_job
+from monitoreo.metrics import span, PAGES_SCRAPED, SEARCH_PAGES, RETRIES, PAGE_LOAD_SECONDS
+import asyncio
 import random
 import time
 import json 
@@ -12,13 +14,22 @@ class JobSearch:
     @classmethod
     async def create(cls, headless=True):
         """Método de clase asíncrono para crear instancias de JobSearch"""
-        instance = cls()
-        instance.playwright = await async_playwright().start()
-        instance.browser = await instance.playwright.firefox.launch(
+        playwright = await async_playwright().start()
+        browser = await playwright.firefox.launch(
             headless=headless,
             args=["--no-sandbox", "--disable-setuid-sandbox"]
         )
-        instance.context = await instance.browser.new_context(
+        instance = await cls.from_browser(browser)
+        instance.playwright = playwright
+        return instance
+
+    @classmethod
+    async def from_browser(cls, browser):
+        """Crea una instancia sobre un navegador ya abierto, por ejemplo el de un worker del pool"""
+        instance = cls()
+        instance.playwright = None
+        instance.browser = browser
+        instance.context = await browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
             locale="en-US"
         )
@@ -26,11 +37,12 @@ class JobSearch:
         instance.current_proxy = None
         return instance
 
-    def _rotate_proxy(self):
+    async def _rotate_proxy(self):
         self.request_count += 1
         if self.request_count % ROTATION_INTERVAL == 0:
             self.current_proxy = random.choice(PROXY_SERVERS)
-            self.context = self.browser.new_context(
+            await self.context.close()
+            self.context = await self.browser.new_context(
                 proxy={"server": self.current_proxy},
                 user_agent=self._random_user_agent()
             )
@@ -81,56 +93,73 @@ class JobSearch:
 
     async def scrape_jobs(self, job_title: str, countries: List[str]) -> List[Dict]:
         results = []
-        page = await self.context.new_page()
 
         try:
             for country in countries:
-                search_url = self.construct_search_url(country, job_title)
-
-                for attempt in range(MAX_RETRIES):
-                    try:
-                        await self._rotate_proxy()
-                        await page.goto(search_url)
-                        await page.wait_for_selector('.jobs-search__results-list', timeout=TIMEOUT)
-
-                        # Handle pagination
-                        for _ in range(3):  # Scrape first 3 pages
-                            job_cards = await page.query_selector_all('li:has(> div.base-card)')
-                            for card in job_cards:
-                                results.append(await self._extract_job_data(card))
-
-                            if await page.is_visible('button[aria-label="Next"]'):
-                                await page.click('button[aria-label="Next"]')
-                                await asyncio.sleep(REQUEST_DELAY)
-                            else:
-                                break
-                        break
-                    except Exception as e:
-                        if attempt == MAX_RETRIES - 1:
-                            raise
-                        await asyncio.sleep(REQUEST_DELAY * 2)
+                results.extend(await self.scrape_country(job_title, country))
 
         finally:
             await self.context.close()
             await self.browser.close()
-            await self.playwright.stop()
+            if self.playwright:
+                await self.playwright.stop()
 
         return results
 
-    def _extract_job_data(self, card) -> Dict:
-        def safe_extract(selector, attr=None):
-            element = card.query_selector(selector)
+    async def scrape_country(self, job_title: str, country: str) -> List[Dict]:
+        """Scrape the first result pages of one (title, country) search"""
+        # El span registra la duración y, si se agotan los reintentos, el fallo de la etapa
+        with span("scrape_country", job_title=job_title, country=country):
+            search_url = self.construct_search_url(country, job_title)
+
+            for attempt in range(MAX_RETRIES):
+                results = []
+                await self._rotate_proxy()
+                page = await self.context.new_page()
+                try:
+                    start = time.perf_counter()
+                    await page.goto(search_url)
+                    await page.wait_for_selector('.jobs-search__results-list', timeout=TIMEOUT)
+                    PAGE_LOAD_SECONDS.observe(time.perf_counter() - start, page="search")
+
+                    # Handle pagination
+                    for _ in range(3):  # Scrape first 3 pages
+                        PAGES_SCRAPED.inc(page="search")
+                        SEARCH_PAGES.inc(country=country)
+                        job_cards = await page.query_selector_all('li:has(> div.base-card)')
+                        for card in job_cards:
+                            job = await self._extract_job_data(card)
+                            job["country"] = country
+                            results.append(job)
+
+                        if await page.is_visible('button[aria-label="Next"]'):
+                            await page.click('button[aria-label="Next"]')
+                            await asyncio.sleep(REQUEST_DELAY)
+                        else:
+                            break
+                    return results
+                except Exception as e:
+                    if attempt == MAX_RETRIES - 1:
+                        raise
+                    RETRIES.inc(stage="scrape_jobs", country=country)
+                    await asyncio.sleep(REQUEST_DELAY * 2)
+                finally:
+                    await page.close()
+
+    async def _extract_job_data(self, card) -> Dict:
+        async def safe_extract(selector, attr=None):
+            element = await card.query_selector(selector)
             if not element:
                 return None
             if attr:
-                return element.get_attribute(attr)
-            return element.inner_text().strip()
+                return await element.get_attribute(attr)
+            return (await element.inner_text()).strip()
 
         return {
-            "title": safe_extract('h3.base-search-card__title'),
-            "company": safe_extract('h4.base-search-card__subtitle a'),
-            "location": safe_extract('span.job-search-card__location'),
-            "posted": safe_extract('time.job-search-card__listdate', 'datetime'),
-            "link": safe_extract('a.base-card__full-link', 'href'),
+            "title": await safe_extract('h3.base-search-card__title'),
+            "company": await safe_extract('h4.base-search-card__subtitle a'),
+            "location": await safe_extract('span.job-search-card__location'),
+            "posted": await safe_extract('time.job-search-card__listdate', 'datetime'),
+            "link": await safe_extract('a.base-card__full-link', 'href'),
             "source": "LinkedIn"
         }
\ No newline at end of file
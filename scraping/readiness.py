@@ -0,0 +1,113 @@
+import asyncio
+from enum import Enum
+from typing import Dict, List
+
+from config.proxies import READY_TIMEOUT
+
+
+class PageOutcome(Enum):
+    """Resultado de esperar a que una publicación esté lista"""
+    OK = "ok"
+    BLOCKED = "blocked"
+    EXPIRED = "expired"
+    TIMEOUT = "timeout"
+
+
+# Firmas de cada resultado en la página pública de una oferta de LinkedIn
+READY_SELECTORS = ['section.top-card-layout']
+SIGNATURES: Dict[PageOutcome, List[str]] = {
+    PageOutcome.BLOCKED: [
+        'form.authwall-join-form',
+        'section.authwall-sign-in-form',
+        '#captcha-internal',
+        'iframe[src*="captcha"]',
+        'form.login__form',
+    ],
+    PageOutcome.EXPIRED: [
+        'figure.closed-job',
+        '.closed-job__flavor--closed',
+        '.jobs-details-top-card__apply-error',
+    ],
+}
+# Los modales de login pueden estar en el HTML ocultos; solo cuentan si se ven
+SIGNATURE_STATES = {PageOutcome.BLOCKED: "visible"}
+# Si varias firmas aparecen a la vez gana la primera de esta lista
+PRIORITY = [PageOutcome.BLOCKED, PageOutcome.EXPIRED, PageOutcome.OK]
+# Redirecciones que delatan el resultado sin esperar ningún selector
+URL_SIGNATURES: Dict[PageOutcome, List[str]] = {
+    PageOutcome.BLOCKED: ['/authwall', '/checkpoint/', '/login', '/uas/login'],
+    PageOutcome.EXPIRED: ['expired_jd_redirect', '/jobs/search'],
+}
+STATUS_OUTCOMES = {403: PageOutcome.BLOCKED, 429: PageOutcome.BLOCKED, 999: PageOutcome.BLOCKED,
+                   404: PageOutcome.EXPIRED, 410: PageOutcome.EXPIRED}
+
+
+def _from_url(url: str):
+    for outcome, fragments in URL_SIGNATURES.items():
+        if any(fragment in url for fragment in fragments):
+            return outcome
+    return None
+
+
+async def goto_ready(page, url: str, budget: int = READY_TIMEOUT) -> PageOutcome:
+    """Navega hasta `domcontentloaded` y espera la primera firma que aparezca
+
+    El contenido esperado compite con las firmas de bloqueo y de oferta cerrada;
+    entre las que aparecen juntas decide `PRIORITY`, y si gana el contenido se
+    confirma que no haya también una firma de bloqueo u oferta cerrada. Si
+    ninguna aparece en `budget` milisegundos, contando la navegación, el
+    resultado es TIMEOUT.
+    """
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    # Un solo plazo para la navegación y la carrera de selectores
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + budget / 1000
+    try:
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=budget)
+    except PlaywrightTimeoutError:
+        return PageOutcome.TIMEOUT
+
+    if response is not None and response.status in STATUS_OUTCOMES:
+        return STATUS_OUTCOMES[response.status]
+    outcome = _from_url(page.url)
+    if outcome:
+        return outcome
+
+    remaining = int((deadline - loop.time()) * 1000)
+    if remaining <= 0:
+        return PageOutcome.TIMEOUT
+    waiters = {
+        asyncio.ensure_future(page.wait_for_selector(
+            ", ".join(selectors), state=SIGNATURE_STATES.get(outcome, "attached"), timeout=remaining
+        )): outcome
+        for outcome, selectors in [(PageOutcome.OK, READY_SELECTORS), *SIGNATURES.items()]
+    }
+    pending = set(waiters)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # Una espera que venció o falló no decide nada; se sigue con las demás
+            matched = {waiters[task] for task in done if not task.cancelled() and task.exception() is None}
+            for outcome in PRIORITY:
+                if outcome in matched:
+                    if outcome is PageOutcome.OK:
+                        return await _recheck(page)
+                    return outcome
+        return PageOutcome.TIMEOUT
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _recheck(page) -> PageOutcome:
+    """El top card también está en ofertas cerradas y detrás de modales: se confirma que no haya firmas"""
+    for outcome in PRIORITY:
+        if outcome is PageOutcome.OK:
+            continue
+        for selector in SIGNATURES[outcome]:
+            element = await page.query_selector(selector)
+            if element and (SIGNATURE_STATES.get(outcome) != "visible" or await element.is_visible()):
+                return outcome
+    return PageOutcome.OK
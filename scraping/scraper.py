@@ -1,115 +1,194 @@
-from playwright.async_api import async_playwright
-from datetime import datetime, timedelta
-import re
-from transformación.transform import transform_data, save_to_json
+from datetime import datetime
+import time
+from transformación.transform import transform_data, save_to_store
+from monitoreo.metrics import span, PAGES_SCRAPED, PAGE_LOAD_SECONDS, FAILURES, CACHE_HITS, PAGE_OUTCOMES
+from config.proxies import DESCRIPTION_TIMEOUT
 
-async def process_job(job_data):
+async def process_job(job_data, browser=None):
     """Procesa un trabajo individual"""
     try:
-        print("\n🚀 Iniciando el proceso de análisis del trabajo...")
-        
-        # Obtener detalles del trabajo
-        print("✨ Obteniendo detalles del trabajo...")
-        job_details = await scrape_job_details(job_data)
-        if not job_details:
-            print("❌ No se pudieron obtener los detalles del trabajo.")
-            return None
-        
-        print("📝 Detalles obtenidos con éxito.")
-        
-        # Transformar y analizar datos
-        print("🔍 Analizando la descripción del trabajo...")
-        transformed_data = transform_data(job_details, job_data['link'])
-        if transformed_data:
-            print("📊 Análisis completado con éxito.")
-        else:
-            print("⚠️  El análisis no generó datos.")
-        
-        # Guardar resultados
-        print("💾 Guardando los resultados...")
-        output_file = save_to_json(transformed_data)
-        print(f"✅ Datos guardados exitosamente en: {output_file}")
-        
-        return {
-            'details': job_details,
-            'transformed': transformed_data,
-            'output_file': output_file
-        }
-        
+        with span("process_job", link=job_data.get('link')):
+            return await _process_job(job_data, browser)
     except Exception as e:
         print(f"❌ Error durante el proceso: {str(e)}")
         return None
 
-async def scrape_job_details(job_data):
-    """Scrape detailed job information from LinkedIn job posting"""
+async def _process_job(job_data, browser=None):
+    """Etapas de process_job: scraping, análisis y guardado"""
+    print("\n🚀 Iniciando el proceso de análisis del trabajo...")
+
+    # Obtener detalles del trabajo
+    print("✨ Obteniendo detalles del trabajo...")
+    job_details = await scrape_job_details(job_data, browser)
+    if not job_details:
+        print("❌ No se pudieron obtener los detalles del trabajo.")
+        return None
+
+    print("📝 Detalles obtenidos con éxito.")
+
+    # Buscar casi duplicados antes de pagar por el análisis del LLM
+    from transformación.dedupe import get_index, job_key_from_link, load_analysis
+    index = get_index()
+    job_key = job_key_from_link(job_data['link'])
+    with span("dedupe"):
+        signature = index.signature(job_details.get('title'), job_details.get('description'))
+        duplicate = None
+        if signature is not None:
+            with index.locked():
+                duplicate = index.query(signature, exclude=job_key)
+        transformed_data = load_analysis(duplicate)
+
+    if transformed_data:
+        CACHE_HITS.inc(kind="near_duplicate")
+        print(f"♻️  Casi duplicado de {duplicate['job_key']} (similitud {duplicate['similarity']:.2f}), se reutiliza su análisis.")
+        # El análisis reutilizado es de otra publicación: ciudad y link son los de esta
+        principal = transformed_data.get('tabla_principal') or [{}]
+        transformed_data['tabla_principal'] = [{
+            **principal[0],
+            'lugar': job_details.get('location') or principal[0].get('lugar', "No se especifica"),
+            'link_publicacion': job_data['link'],
+        }, *principal[1:]]
+    else:
+        # Transformar y analizar datos
+        print("🔍 Analizando la descripción del trabajo...")
+        with span("transform"):
+            transformed_data = transform_data(job_details, job_data['link'])
+    if transformed_data:
+        print("📊 Análisis completado con éxito.")
+        cluster_id = duplicate['cluster_id'] if duplicate else job_key
+        transformed_data = {
+            **transformed_data,
+            'job_key': job_key,
+            'cluster_id': cluster_id,
+            'duplicado_de': duplicate['job_key'] if duplicate else None,
+            'country': job_data.get('country'),
+            # Textos crudos del scraper; el warehouse los normaliza anclados a fecha_extraccion
+            'posted_date': job_details.get('posted_date'),
+            'applicants': job_details.get('applicants'),
+            'fecha_extraccion': job_details.get('fetched_at')
+        }
+    else:
+        print("⚠️  El análisis no generó datos.")
+
+    # Guardar resultados
+    print("💾 Guardando los resultados...")
+    with span("save"):
+        output_file = save_to_store(transformed_data)
+    print(f"✅ Datos guardados exitosamente en: {output_file}")
+
+    if output_file and signature is not None:
+        with index.locked():
+            index.add(job_key, signature, cluster_id, output_file)
+            index.save()
+
+    # Índice de texto completo de la descripción, actualizado trabajo a trabajo
+    from transformación.search_index import index_job
+    with span("search_index"):
+        index_job(job_key, job_details)
+
+    return {
+        'details': job_details,
+        'transformed': transformed_data,
+        'output_file': output_file
+    }
+
+async def scrape_job_details(job_data, browser=None):
+    """Scrape detailed job information from LinkedIn job posting
+
+    If `browser` is given (e.g. a worker of the process pool) only a new page is
+    opened on it; otherwise a dedicated Firefox is launched and closed.
+    """
+    from playwright.async_api import async_playwright
+
     try:
         print("\n🌐 Iniciando scraping de detalles del trabajo...")
         
+        if browser is not None:
+            return await _scrape_on_browser(browser, job_data)
+
         async with async_playwright() as p:
             browser = await p.firefox.launch(headless=False)
-            page = await browser.new_page()
-            await page.goto(job_data['link'])
-            
-            # Esperar a que el contenedor principal esté cargado
-            await page.wait_for_selector('section.top-card-layout')
-            print("📄 Página cargada correctamente.")
-            
-            # Extraer detalles principales
-            print("🔍 Extrayendo información principal...")
-            title = await page.query_selector('h1.top-card-layout__title')
-            company = await page.query_selector('a.topcard__org-name-link')
-            location = await page.query_selector('span.topcard__flavor--bullet')
-            posted_date = await page.query_selector('span.posted-time-ago__text')
-            applicants = await page.query_selector('span.num-applicants__caption')
-            
-            job_details = {
-                **job_data,  # Incluir los datos básicos originales
-                'title': await title.inner_text() if title else None,
-                'company': await company.inner_text() if company else None,
-                'location': await location.inner_text() if location else None,
-                'posted_date': await posted_date.inner_text() if posted_date else None,
-                'applicants': await applicants.inner_text() if applicants else None,
-                'description': None
-            }
-            
-            # Extraer ubicación, fecha y aplicantes
-            print("📍 Actualizando ubicación, fecha y aplicantes...")
-            primary_desc = await page.query_selector('div.job-details-jobs-unified-top-card__primary-description-container')
-            if primary_desc:
-                elements = await primary_desc.query_selector_all('span.tvm__text--low-emphasis')
-                if len(elements) >= 3:
-                    job_details['location'] = await elements[0].inner_text()
-                    job_details['posted_date'] = await elements[1].inner_text()
-                    job_details['applicants'] = await elements[2].inner_text()
-            
-            # Extraer descripción del trabajo
-            print("📄 Extrayendo descripción del puesto...")
-            await page.wait_for_selector('section.description')
-            description = await page.query_selector('section.description')
-            if description:
-                job_details['description'] = await description.inner_text()
-            
-            print("✅ Detalles del trabajo extraídos con éxito.")
-            await browser.close()
-            return job_details
+            try:
+                return await _scrape_on_browser(browser, job_data)
+            finally:
+                await browser.close()
             
     except Exception as e:
+        FAILURES.inc(stage="scrape_job_details")
         print(f"❌ Error scraping job details: {str(e)}")
         return None
 
-def parse_posted_date(text):
-    """Parse LinkedIn's relative date format"""
-    if 'hora' in text or 'hour' in text:
-        num = int(re.search(r'\d+', text).group())
-        return datetime.now() - timedelta(hours=num)
-    elif 'día' in text or 'day' in text:
-        num = int(re.search(r'\d+', text).group())
-        return datetime.now() - timedelta(days=num)
-    elif 'semana' in text or 'week' in text:
-        num = int(re.search(r'\d+', text).group())
-        return datetime.now() - timedelta(weeks=num)
-    else:
-        return datetime.now()
+async def _scrape_on_browser(browser, job_data):
+    """Abre una página en el navegador dado y extrae los detalles del trabajo"""
+    page = await browser.new_page()
+    try:
+        return await _extract_job_details(page, job_data)
+    finally:
+        await page.close()
+
+async def _extract_job_details(page, job_data):
+    """Navega a la publicación y extrae sus campos; None si está bloqueada, cerrada o no cargó"""
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    from scraping.readiness import PageOutcome, goto_ready
+
+    with span("page_load", link=job_data['link']):
+        start = time.perf_counter()
+        # domcontentloaded + carrera contra firmas de bloqueo: un authwall falla en milisegundos
+        outcome = await goto_ready(page, job_data['link'])
+        PAGE_OUTCOMES.inc(page="job_details", outcome=outcome.value)
+        if outcome is not PageOutcome.OK:
+            FAILURES.inc(stage="page_load")
+            print(f"⛔ Publicación no disponible ({outcome.value}) tras {time.perf_counter() - start:.1f}s")
+            return None
+        PAGE_LOAD_SECONDS.observe(time.perf_counter() - start, page="job_details")
+        PAGES_SCRAPED.inc(page="job_details")
+    print("📄 Página cargada correctamente.")
+    
+    # Extraer detalles principales
+    print("🔍 Extrayendo información principal...")
+    title = await page.query_selector('h1.top-card-layout__title')
+    company = await page.query_selector('a.topcard__org-name-link')
+    location = await page.query_selector('span.topcard__flavor--bullet')
+    posted_date = await page.query_selector('span.posted-time-ago__text')
+    applicants = await page.query_selector('span.num-applicants__caption')
+    
+    job_details = {
+        **job_data,  # Incluir los datos básicos originales
+        'title': await title.inner_text() if title else None,
+        'company': await company.inner_text() if company else None,
+        'location': await location.inner_text() if location else None,
+        'posted_date': await posted_date.inner_text() if posted_date else None,
+        'applicants': await applicants.inner_text() if applicants else None,
+        'description': None,
+        'fetched_at': datetime.now().isoformat()
+    }
+    
+    # Extraer ubicación, fecha y aplicantes
+    print("📍 Actualizando ubicación, fecha y aplicantes...")
+    primary_desc = await page.query_selector('div.job-details-jobs-unified-top-card__primary-description-container')
+    if primary_desc:
+        elements = await primary_desc.query_selector_all('span.tvm__text--low-emphasis')
+        if len(elements) >= 3:
+            job_details['location'] = await elements[0].inner_text()
+            job_details['posted_date'] = await elements[1].inner_text()
+            job_details['applicants'] = await elements[2].inner_text()
+    
+    # Extraer descripción del trabajo
+    print("📄 Extrayendo descripción del puesto...")
+    try:
+        description = await page.wait_for_selector('section.description', timeout=DESCRIPTION_TIMEOUT)
+    except PlaywrightTimeoutError:
+        description = None
+    if description:
+        job_details['description'] = await description.inner_text()
+    
+    print("✅ Detalles del trabajo extraídos con éxito.")
+    return job_details
+
+def parse_posted_date(text, anchor=None):
+    """Parse LinkedIn's relative date format (see transformación.normalize for whole columns)"""
+    from transformación.normalize import parse_relative_date
+    return parse_relative_date(text, anchor)
 
 if __name__ == "__main__":
     test_urls = [
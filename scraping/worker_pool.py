@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import queue
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from monitoreo.metrics import REGISTRY
+from config.workers import WORKER_COUNT, PAGES_PER_WORKER, MAX_WORKER_RESTARTS, WORKER_HEADLESS
+
+
+def search_task(job_title: str, country: str) -> Dict:
+    """Tarea de búsqueda de un título en un país"""
+    return {"kind": "search", "job_title": job_title, "country": country}
+
+
+def job_task(job: Dict) -> Dict:
+    """Tarea de scraping y análisis de una publicación"""
+    return {"kind": "job", "job": job}
+
+
+def _worker_main(worker_id: int, tasks, results, pages_per_worker: int, headless: bool):
+    """Punto de entrada de cada proceso del pool"""
+    asyncio.run(_worker_loop(worker_id, tasks, results, pages_per_worker, headless))
+
+
+async def _worker_loop(worker_id: int, tasks, results, pages_per_worker: int, headless: bool):
+    from playwright.async_api import async_playwright
+    from scraping.job_search import JobSearch
+    from scraping.scraper import process_job
+
+    loop = asyncio.get_running_loop()
+
+    async with async_playwright() as p:
+        browser = await p.firefox.launch(
+            headless=headless,
+            args=["--no-sandbox", "--disable-setuid-sandbox"]
+        )
+
+        async def consume():
+            search = None
+            while True:
+                # Queue.get bloquea, se espera en un hilo para no detener el event loop
+                item = await loop.run_in_executor(None, tasks.get)
+                if item is None:
+                    return
+                task_id, task = item
+                results.put(("started", worker_id, task_id))
+                try:
+                    if task["kind"] == "search":
+                        if search is None:
+                            search = await JobSearch.from_browser(browser)
+                        payload = await search.scrape_country(task["job_title"], task["country"])
+                    else:
+                        payload = await process_job(task["job"], browser)
+                    ok = True
+                except Exception as e:
+                    ok, payload = False, f"{type(e).__name__}: {e}"
+                # Las métricas del worker viajan con cada resultado; el padre es quien las exporta
+                results.put(("done", worker_id, task_id, ok, payload, REGISTRY.drain()))
+
+        try:
+            await asyncio.gather(*(consume() for _ in range(pages_per_worker)))
+        finally:
+            await browser.close()
+
+
+class WorkerPool:
+    """Pool de procesos; cada worker tiene su propio navegador y consume tareas de una cola compartida"""
+
+    def __init__(self, workers: int = WORKER_COUNT, pages_per_worker: int = PAGES_PER_WORKER,
+                 max_restarts: int = MAX_WORKER_RESTARTS, headless: bool = WORKER_HEADLESS):
+        self.workers = max(1, workers)
+        self.pages_per_worker = max(1, pages_per_worker)
+        self.max_restarts = max_restarts
+        self.headless = headless
+        # spawn: Playwright no es seguro tras un fork
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def _start(self, worker_id: int, tasks, results):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, tasks, results, self.pages_per_worker, self.headless),
+            name=f"scraping-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def run(self, tasks: Iterable[Dict]) -> Iterator[Dict]:
+        """Reparte las tareas y devuelve cada resultado en cuanto llega al proceso padre"""
+        tasks: List[Dict] = list(tasks)
+        if not tasks:
+            return
+
+        task_queue = self._ctx.Queue()
+        result_queue = self._ctx.Queue()
+        for task_id, task in enumerate(tasks):
+            task_queue.put((task_id, task))
+
+        worker_ids = range(min(self.workers, len(tasks)))
+        processes = {wid: self._start(wid, task_queue, result_queue) for wid in worker_ids}
+        restarts = {wid: 0 for wid in worker_ids}
+        in_flight = {wid: set() for wid in worker_ids}
+        pending = set(range(len(tasks)))
+
+        def handle(message) -> Optional[Dict]:
+            if message[0] == "started":
+                in_flight[message[1]].add(message[2])
+                return None
+            _, wid, task_id, ok, payload, metrics = message
+            REGISTRY.merge(metrics)
+            in_flight[wid].discard(task_id)
+            if task_id not in pending:
+                return None  # Resultado repetido de una tarea reencolada
+            pending.discard(task_id)
+            result = {"task": tasks[task_id], "worker": wid, "ok": ok}
+            result["result" if ok else "error"] = payload
+            return result
+
+        print(f"🧵 Pool iniciado: {len(processes)} workers x {self.pages_per_worker} páginas, {len(tasks)} tareas")
+        idle_polls = 0
+        try:
+            while pending:
+                try:
+                    result = handle(result_queue.get(timeout=1))
+                    idle_polls = 0
+                except queue.Empty:
+                    result = None
+                    # Un worker que cae entre tasks.get() y el aviso "started" se lleva la
+                    # tarea sin dejarla en la cola ni en vuelo: si todo sigue quieto, se reencola
+                    if task_queue.empty() and not any(in_flight.values()):
+                        idle_polls += 1
+                        if idle_polls >= 2:
+                            print(f"⚠️  {len(pending)} tareas sin worker asignado, reencolando")
+                            for task_id in sorted(pending):
+                                task_queue.put((task_id, tasks[task_id]))
+                            idle_polls = 0
+                    else:
+                        idle_polls = 0
+                    for wid, process in list(processes.items()):
+                        if process.is_alive():
+                            continue
+                        # Procesar lo que el worker alcanzó a enviar antes de caer
+                        while True:
+                            try:
+                                drained = handle(result_queue.get_nowait())
+                            except queue.Empty:
+                                break
+                            if drained:
+                                yield drained
+                        for task_id in in_flight[wid]:
+                            if task_id in pending:
+                                task_queue.put((task_id, tasks[task_id]))
+                        in_flight[wid].clear()
+                        if restarts[wid] < self.max_restarts:
+                            restarts[wid] += 1
+                            print(f"⚠️  Worker {wid} terminó con código {process.exitcode}, reiniciando "
+                                  f"({restarts[wid]}/{self.max_restarts})")
+                            processes[wid] = self._start(wid, task_queue, result_queue)
+                        else:
+                            print(f"❌ Worker {wid} superó el máximo de reinicios")
+                            del processes[wid]
+                    if not processes and pending:
+                        raise RuntimeError(f"Todos los workers fallaron con {len(pending)} tareas pendientes")
+                if result:
+                    yield result
+        finally:
+            for _ in range(len(processes) * self.pages_per_worker):
+                task_queue.put(None)
+            for process in processes.values():
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
@@ -0,0 +1,251 @@
+import os
+import pickle
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from config.analytics import SKILLS_MODEL_PATH, MIN_SUPPORT, GROUP_DIMENSIONS
+from transformación.warehouse_reader import iter_job_batches, job_keys, read_dimension
+
+NO_ESPECIFICA = "No se especifica"
+# Cambia cuando cambia cómo se identifican los trabajos; un modelo de otra versión se reconstruye
+MODEL_VERSION = 2
+
+
+def _grow(matrix: sparse.csr_matrix, shape) -> sparse.csr_matrix:
+    """Amplía una matriz dispersa con ceros cuando crecen los vocabularios"""
+    if matrix.shape != shape:
+        matrix = matrix.tocsr(copy=True)
+        matrix.resize(shape)
+    return matrix
+
+
+class _Vocabulary:
+    """Valor -> índice de fila o columna, que solo crece"""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.index: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, values) -> np.ndarray:
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            code = self.index.get(value)
+            if code is None:
+                code = self.index[value] = len(self.values)
+                self.values.append(value)
+            codes[i] = code
+        return codes
+
+
+class SkillAnalytics:
+    """Co-ocurrencia de tecnologías y su asociación con seniority y empresa
+
+    Cada trabajo es una fila binaria de la matriz de incidencia X (trabajos x
+    tecnologías). No se guarda X: solo C = XᵀX, los conteos por tecnología y, por
+    cada dimensión de agrupación, G_dᵀX. Como son sumas sobre trabajos, un lote
+    nuevo se incorpora sumando sus productos, sin recalcular lo anterior.
+    """
+
+    def __init__(self, path: str = SKILLS_MODEL_PATH, dimensions: List[str] = GROUP_DIMENSIONS):
+        self.path = path
+        self.dimensions = list(dimensions)
+        self.jobs = set()  # claves de warehouse_reader.job_keys ya contadas
+        self.technologies = _Vocabulary()
+        self.cooccurrence = sparse.csr_matrix((0, 0), dtype=np.int64)
+        self.groups = {
+            dim: {
+                "values": _Vocabulary(),
+                "totals": np.zeros(0, dtype=np.int64),  # trabajos por grupo
+                "by_tech": sparse.csr_matrix((0, 0), dtype=np.int64),  # G_dᵀX
+            }
+            for dim in self.dimensions
+        }
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        if state["dimensions"] != self.dimensions or state.get("version") != MODEL_VERSION:
+            print("⚠️  Formato o dimensiones de la analítica de habilidades cambiaron, se reconstruirá desde cero.")
+            return
+        self.jobs = state["jobs"]
+        self.technologies = state["technologies"]
+        self.cooccurrence = state["cooccurrence"]
+        self.groups = state["groups"]
+
+    def save(self):
+        """Guarda las matrices de forma atómica"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "version": MODEL_VERSION,
+                "dimensions": self.dimensions,
+                "jobs": self.jobs,
+                "technologies": self.technologies,
+                "cooccurrence": self.cooccurrence,
+                "groups": self.groups,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def total_jobs(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def tech_counts(self) -> np.ndarray:
+        """Trabajos por tecnología: la diagonal de C"""
+        return self.cooccurrence.diagonal()
+
+    def update(self, principal: pd.DataFrame, requerimientos: pd.DataFrame,
+               tecnologias: Optional[pd.DataFrame] = None) -> int:
+        """Incorpora los trabajos que aún no se contaron; devuelve cuántos se agregaron
+
+        `requerimientos` se une a `principal` por job_id, que solo vale dentro de una
+        misma carga del warehouse; entre cargas los trabajos se identifican por
+        cluster_id, así las publicaciones casi duplicadas cuentan una sola vez.
+        """
+        if principal.empty:
+            return 0
+        principal = principal.assign(_key=job_keys(principal))
+        principal = principal[principal["_key"].notna() & ~principal["_key"].isin(self.jobs)]
+        principal = principal.drop_duplicates("_key")
+        if principal.empty:
+            return 0
+
+        # Nombres canónicos: los IDs de las tecnologías desconocidas cambian entre cargas
+        reqs = requerimientos[requerimientos["job_id"].isin(principal["job_id"])]
+        if tecnologias is not None and "tecnologia_id" in reqs:
+            names = tecnologias.set_index("tecnologia_id")["tecnologia"]
+            tech = reqs["tecnologia_id"].map(names).fillna(reqs["tecnologia"])
+        else:
+            tech = reqs["tecnologia"]
+        reqs = pd.DataFrame({"job_id": reqs["job_id"], "tecnologia": tech})
+        reqs = reqs[reqs["tecnologia"].notna() & (reqs["tecnologia"] != NO_ESPECIFICA)]
+
+        rows = pd.Series(np.arange(len(principal)), index=principal["job_id"].values)
+        row_idx = rows.reindex(reqs["job_id"].values).to_numpy()
+        col_idx = self.technologies.encode(reqs["tecnologia"].tolist())
+        n_new, n_tech = len(principal), len(self.technologies)
+
+        # Incidencia binaria del lote: los duplicados de (trabajo, tecnología) se colapsan
+        x_new = sparse.csr_matrix(
+            (np.ones(len(row_idx), dtype=np.int64), (row_idx, col_idx)), shape=(n_new, n_tech)
+        )
+        x_new.data[:] = 1
+
+        self.cooccurrence = _grow(self.cooccurrence, (n_tech, n_tech)) + (x_new.T @ x_new).tocsr()
+
+        for dim, group in self.groups.items():
+            values = principal[dim].fillna(NO_ESPECIFICA).astype(str).tolist() if dim in principal \
+                else [NO_ESPECIFICA] * n_new
+            codes = group["values"].encode(values)
+            n_groups = len(group["values"])
+            g_new = sparse.csr_matrix(
+                (np.ones(n_new, dtype=np.int64), (np.arange(n_new), codes)), shape=(n_new, n_groups)
+            )
+            totals = np.zeros(n_groups, dtype=np.int64)
+            totals[:len(group["totals"])] = group["totals"]
+            group["totals"] = totals + np.bincount(codes, minlength=n_groups)
+            group["by_tech"] = _grow(group["by_tech"], (n_groups, n_tech)) + (g_new.T @ x_new).tocsr()
+
+        self.jobs.update(principal["_key"].tolist())
+        return n_new
+
+    def top_technologies(self, k: int = 20) -> pd.DataFrame:
+        counts = self.tech_counts
+        order = np.argsort(-counts)[:k]
+        return pd.DataFrame({
+            "tecnologia": [self.technologies.values[i] for i in order],
+            "trabajos": counts[order],
+            "porcentaje": counts[order] / max(self.total_jobs, 1),
+        })
+
+    def top_pairs(self, k: int = 20, min_support: int = MIN_SUPPORT, by: str = "lift") -> pd.DataFrame:
+        """Pares de tecnologías que aparecen juntas, con soporte y lift
+
+        lift = N·C_ab / (n_a·n_b): cuántas veces más aparecen juntas de lo que se
+        esperaría si fueran independientes.
+        """
+        upper = sparse.triu(self.cooccurrence, k=1).tocoo()
+        keep = upper.data >= min_support
+        a, b, together = upper.row[keep], upper.col[keep], upper.data[keep]
+        counts = self.tech_counts
+        lift = self.total_jobs * together / (counts[a] * counts[b])
+        pairs = pd.DataFrame({
+            "tecnologia_a": [self.technologies.values[i] for i in a],
+            "tecnologia_b": [self.technologies.values[i] for i in b],
+            "trabajos": together,
+            "lift": lift,
+        })
+        return pairs.sort_values(by, ascending=False).head(k).reset_index(drop=True)
+
+    def similar(self, technology: str, k: int = 10, min_support: int = 1) -> pd.DataFrame:
+        """Tecnologías más parecidas por similitud coseno de sus columnas en X"""
+        tech = self.technologies.index.get(technology)
+        if tech is None:
+            return pd.DataFrame(columns=["tecnologia", "trabajos", "similitud"])
+        row = self.cooccurrence.getrow(tech).tocoo()
+        keep = (row.col != tech) & (row.data >= min_support)
+        cols, together = row.col[keep], row.data[keep]
+        counts = self.tech_counts
+        similarity = together / np.sqrt(counts[tech] * counts[cols])
+        order = np.argsort(-similarity)[:k]
+        return pd.DataFrame({
+            "tecnologia": [self.technologies.values[cols[i]] for i in order],
+            "trabajos": together[order],
+            "similitud": similarity[order],
+        })
+
+    def group_lift(self, dimension: str, value: Optional[str] = None, k: int = 20,
+                   min_support: int = MIN_SUPPORT) -> pd.DataFrame:
+        """Tecnologías sobrerrepresentadas en un grupo (seniority, empresa) frente al total
+
+        lift = N·GX_gt / (n_g·n_t). Sin `value` se devuelven las asociaciones más
+        fuertes de todos los grupos.
+        """
+        group = self.groups[dimension]
+        selected = np.arange(len(group["values"]))
+        if value is not None:
+            g = group["values"].index.get(value)
+            if g is None:
+                return pd.DataFrame(columns=[dimension, "tecnologia", "trabajos", "lift"])
+            selected = np.array([g])
+        coo = group["by_tech"][selected].tocoo()
+        keep = coo.data >= min_support
+        g_idx, t_idx, together = selected[coo.row[keep]], coo.col[keep], coo.data[keep]
+        group_totals = group["totals"]
+        counts = self.tech_counts
+        lift = self.total_jobs * together / (group_totals[g_idx] * counts[t_idx])
+        result = pd.DataFrame({
+            dimension: [group["values"].values[i] for i in g_idx],
+            "tecnologia": [self.technologies.values[i] for i in t_idx],
+            "trabajos": together,
+            "lift": lift,
+        })
+        return result.sort_values("lift", ascending=False).head(k).reset_index(drop=True)
+
+    def group_values(self, dimension: str) -> List[str]:
+        return list(self.groups[dimension]["values"].values)
+
+
+def update_from_warehouse(wh_path: str = "data/warehouse") -> int:
+    """Actualiza el modelo persistido con los trabajos nuevos de las tablas del warehouse"""
+    analytics = SkillAnalytics()
+    tecnologias = read_dimension(wh_path, "tecnologias")
+    added = 0
+    for principal, requerimientos in iter_job_batches(
+        wh_path, analytics.dimensions, ["tecnologia", "tecnologia_id"]
+    ):
+        added += analytics.update(principal, requerimientos, tecnologias)
+    if added:
+        analytics.save()
+    return added
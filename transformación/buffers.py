@@ -0,0 +1,141 @@
+import json
+import os
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+class ColumnarBuffer:
+    """Acumula las filas de una tabla en columnas compactas y las vuelca a disco por bloques
+
+    Las columnas enteras se guardan en `array('q')` y las de texto como códigos
+    `array('i')` sobre un diccionario de valores internados (categórico), así cada
+    valor repetido como "No se especifica" ocupa 4 bytes por fila. Los valores que
+    no son texto (números, listas) se internan con su tipo original. Si se pasa
+    `derive`, cada bloque se convierte en DataFrame al volcarse y la función
+    agrega columnas calculadas de forma vectorizada.
+    """
+
+    def __init__(self, name: str, columns: List[str], spill_dir: str, chunk_rows: int,
+                 int_columns: Optional[List[str]] = None, derive: Optional[Callable] = None):
+        self.name = name
+        self.derive = derive
+        self.columns = columns
+        self.int_columns = set(int_columns or [])
+        self.spill_path = os.path.join(spill_dir, f"{name}.jsonl")
+        self.chunk_rows = chunk_rows
+        self.spilled_rows = 0
+        self._reset()
+        # Un spill de una ejecución interrumpida no debe mezclarse con esta
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+    def _reset(self):
+        self._data = {
+            col: array('q') if col in self.int_columns else array('i')
+            for col in self.columns
+        }
+        self._codes = {}
+        self._strings = []
+
+    def _encode(self, value) -> int:
+        if value is None:
+            return -1
+        # El valor se guarda tal cual (3 sigue siendo int, una lista sigue siendo lista);
+        # la clave del diccionario distingue tipos y hace hasheables listas y dicts
+        key = value if isinstance(value, str) else (type(value).__name__, json.dumps(value, ensure_ascii=False, sort_keys=True))
+        code = self._codes.get(key)
+        if code is None:
+            code = len(self._strings)
+            self._codes[key] = code
+            self._strings.append(value)
+        return code
+
+    def __len__(self):
+        return self.spilled_rows + len(self._data[self.columns[0]])
+
+    def append(self, row: Dict[str, Any]):
+        for col in self.columns:
+            value = row.get(col)
+            if col in self.int_columns:
+                self._data[col].append(value)
+            else:
+                self._data[col].append(self._encode(value))
+        if len(self._data[self.columns[0]]) >= self.chunk_rows:
+            self.flush()
+
+    def _memory_rows(self) -> Iterator[Dict[str, Any]]:
+        strings = self._strings
+        columns = [(col, col in self.int_columns, self._data[col]) for col in self.columns]
+        for i in range(len(self._data[self.columns[0]])):
+            row = {}
+            for col, is_int, values in columns:
+                value = values[i]
+                row[col] = value if is_int else (strings[value] if value >= 0 else None)
+            yield row
+
+    @property
+    def _only_strings(self) -> bool:
+        return all(isinstance(value, str) for value in self._strings)
+
+    def to_frame(self):
+        """Bloque en memoria como DataFrame, con las columnas de texto como categóricas"""
+        import pandas as pd
+
+        frame = {}
+        for col in self.columns:
+            values = self._data[col]
+            if col in self.int_columns:
+                frame[col] = pd.array(values, dtype="Int64")
+            elif self._only_strings:
+                frame[col] = pd.Categorical.from_codes(values, categories=pd.Index(self._strings, dtype=object))
+            else:
+                # Listas o dicts no pueden ser categorías, y 3000 y 3000.0 (o 1 y True) son
+                # categorías repetidas para pandas: columna de objetos con los valores originales
+                frame[col] = pd.Series([self._strings[c] if c >= 0 else None for c in values], dtype=object)
+        return pd.DataFrame(frame)
+
+    def flush(self):
+        """Vuelca el bloque en memoria al archivo de spill y libera sus columnas"""
+        pending = len(self._data[self.columns[0]])
+        if not pending:
+            return
+        os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+        with open(self.spill_path, 'a', encoding='utf-8') as f:
+            if self.derive:
+                lines = self.derive(self.to_frame()).to_json(
+                    orient="records", lines=True, force_ascii=False, date_format="iso"
+                )
+                f.write(lines if lines.endswith("\n") else lines + "\n")
+            else:
+                for row in self._memory_rows():
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.spilled_rows += pending
+        self._reset()
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Itera todas las filas, primero las volcadas y luego las que siguen en memoria"""
+        if self.spilled_rows:
+            with open(self.spill_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    yield json.loads(line)
+        yield from self._memory_rows()
+
+    def write_json(self, path: str):
+        """Escribe la tabla completa como arreglo JSON, fila por fila y de forma atómica"""
+        self.flush()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out:
+            out.write("[")
+            first = True
+            for row in self.rows():
+                out.write("\n    " if first else ",\n    ")
+                out.write(json.dumps(row, ensure_ascii=False))
+                first = False
+            out.write("\n]\n")
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        self.spilled_rows = 0
+        self._reset()
@@ -1,33 +1,78 @@
-import pandas as pd
 import os
+import sys
 import json
 from typing import Dict, Any
 
+# Permite importar los paquetes del proyecto al ejecutar el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoreo.metrics import span, write_prometheus_textfile
+from monitoreo.profiling import profiled
+from config.warehouse import CHUNK_ROWS
+from transformación.buffers import ColumnarBuffer
+from transformación.technologies import TechnologyIndex
+from transformación.normalize import normalize_principal
+from transformación.segment_store import SegmentStore
+from transformación import analytics, trend_cube
+
+TABLE_COLUMNS = {
+    "principal": [
+        "job_id", "job_key", "nombre_puesto", "empresa", "lugar", "tipo_contrato", "link_publicacion",
+        "fecha_publicacion", "nivel_puesto", "industria", "fuente_publicacion",
+        "salario_estimado", "fecha_cierre", "cluster_id", "duplicado_de",
+        "posted_date", "applicants", "fecha_extraccion", "pais"
+    ],
+    "requerimientos": ["job_id", "tipo_requerimiento", "tecnologia", "tecnologia_id", "nivel_o_anos"],
+    "beneficios": ["job_id", "beneficio"],
+    "actividades": ["job_id", "actividad"]
+}
+
 class DataWarehouse:
-    def __init__(self):
+    def __init__(self, chunk_rows: int = CHUNK_ROWS):
         self.job_id = 1
         self.data_path = "data/job_details"
         self.wh_path = "data/warehouse"
-        self.tables = {
-            "principal": [],
-            "requerimientos": [],
-            "beneficios": [],
-            "actividades": []
-        }
+        self.chunk_rows = chunk_rows
         
         # Crear directorio de warehouse si no existe
         if not os.path.exists(self.wh_path):
             os.makedirs(self.wh_path)
 
+        self.tables = self._new_tables()
+        self.technologies = TechnologyIndex()
+
+    def _new_tables(self) -> Dict[str, ColumnarBuffer]:
+        """Buffers columnares por tabla, volcados a data/warehouse/_spill cada `chunk_rows` filas"""
+        spill_dir = os.path.join(self.wh_path, "_spill")
+        # La tabla principal se normaliza (fechas, salarios, postulantes) bloque a bloque al volcarse
+        derive = {"principal": normalize_principal}
+        return {
+            name: ColumnarBuffer(name, columns, spill_dir, self.chunk_rows,
+                                 int_columns=["job_id", "tecnologia_id"], derive=derive.get(name))
+            for name, columns in TABLE_COLUMNS.items()
+        }
+
     def process_job_details(self):
-        """Procesar todos los archivos JSON en data/job_details"""
-        for filename in os.listdir(self.data_path):
-            if filename.endswith(".json"):
-                job_path = os.path.join(self.data_path, filename)
-                with open(job_path, 'r', encoding='utf-8') as f:
-                    job_data = json.load(f)
-                    self.process_job(job_data)
-                    self.job_id += 1
+        """Procesar los detalles del store segmentado y los archivos JSON sueltos en data/job_details"""
+        with span("warehouse.process_job_details", data_path=self.data_path):
+            # Lectura secuencial del log, un registro (el último) por job_key
+            for job_key, job_data in SegmentStore().iter_records():
+                if not job_data.get("job_key"):
+                    job_data["job_key"] = job_key
+                self.process_job(job_data)
+                self.job_id += 1
+
+            # Archivos por trabajo escritos antes del store segmentado
+            for filename in os.listdir(self.data_path):
+                if filename.endswith(".json"):
+                    job_path = os.path.join(self.data_path, filename)
+                    with open(job_path, 'r', encoding='utf-8') as f:
+                        job_data = json.load(f)
+                        # El nombre del archivo es la única clave estable de estos trabajos
+                        if not job_data.get("job_key"):
+                            job_data["job_key"] = f"legacy:{os.path.splitext(filename)[0]}"
+                        self.process_job(job_data)
+                        self.job_id += 1
 
     def process_job(self, job_data: Dict[str, Any]):
         """Procesar un solo trabajo y cargar los datos en las tablas"""
@@ -35,6 +80,7 @@ class DataWarehouse:
         principal_data = job_data.get('tabla_principal', [{}])[0]
         principal = {
             "job_id": self.job_id,
+            "job_key": job_data.get("job_key"),
             "nombre_puesto": principal_data.get("nombre_puesto", "No se especifica"),
             "empresa": principal_data.get("empresa", "No se especifica"),
             "lugar": principal_data.get("lugar", "No se especifica"),
@@ -45,15 +91,34 @@ class DataWarehouse:
             "industria": principal_data.get("industria", "No se especifica"),
             "fuente_publicacion": principal_data.get("fuente_publicacion", "No se especifica"),
             "salario_estimado": principal_data.get("salario_estimado", "No se especifica"),
-            "fecha_cierre": principal_data.get("fecha_cierre", "No se especifica")
+            "fecha_cierre": principal_data.get("fecha_cierre", "No se especifica"),
+            "cluster_id": job_data.get("cluster_id"),
+            "duplicado_de": job_data.get("duplicado_de"),
+            "posted_date": job_data.get("posted_date"),
+            "applicants": job_data.get("applicants"),
+            "fecha_extraccion": job_data.get("fecha_extraccion"),
+            "pais": job_data.get("country")
         }
         self.tables["principal"].append(principal)
 
         # Tabla de Requerimientos
+        requerimientos = []
         for requerimiento in job_data.get("tabla_requerimientos", []):
+            tecnologia = requerimiento.get("tecnologia")
+            # Una lista de tecnologías en un requerimiento se abre en una fila por tecnología
+            if isinstance(tecnologia, list):
+                requerimientos.extend({**requerimiento, "tecnologia": item} for item in tecnologia if item is not None)
+            else:
+                requerimientos.append(requerimiento)
+        # Tecnologías canónicas para toda la columna del trabajo de una vez
+        tecnologia_ids = self.technologies.canonicalize(
+            r.get("tecnologia", "No se especifica") for r in requerimientos
+        )
+        for requerimiento, tecnologia_id in zip(requerimientos, tecnologia_ids):
             requirement = {
                 "tipo_requerimiento": requerimiento.get("tipo_requerimiento", "No se especifica"),
                 "tecnologia": requerimiento.get("tecnologia", "No se especifica"),
+                "tecnologia_id": tecnologia_id,
                 "nivel_o_anos": requerimiento.get("nivel_o_anos", "No se especifica")
             }
             self.tables["requerimientos"].append({
@@ -81,6 +146,7 @@ class DataWarehouse:
             "job_id": self.job_id,
             "tipo_requerimiento": requirement.get("type", "No se especifica"),
             "tecnologia": requirement.get("technology", "No se especifica"),
+            "tecnologia_id": self.technologies.canonicalize([requirement.get("technology")])[0],
             "nivel_o_anos": requirement.get("level_years", "No se especifica")
         }
         self.tables["requerimientos"].append(requerimiento)
@@ -106,22 +172,32 @@ class DataWarehouse:
         os.makedirs(self.wh_path, exist_ok=True)
         
         for table_name, table_data in self.tables.items():
-            if table_data:
+            if len(table_data):
                 table_path = os.path.join(self.wh_path, f"{table_name}.json")
-                with open(table_path, 'w', encoding='utf-8') as f:
-                    json.dump(table_data, f, indent=4, ensure_ascii=False)
-        
-        self.tables = {
-            "principal": [],
-            "requerimientos": [],
-            "beneficios": [],
-            "actividades": []
-        }
+                with span("warehouse.save_table", table=table_name, rows=len(table_data)):
+                    table_data.write_json(table_path)
+            table_data.clear()
+
+        # Dimensión de tecnologías canónicas referenciada por requerimientos.tecnologia_id
+        with open(os.path.join(self.wh_path, "tecnologias.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.technologies.dimension(), f, indent=4, ensure_ascii=False)
 
+@profiled("warehouse")
 def main():
-    warehouse = DataWarehouse()
-    warehouse.process_job_details()
-    warehouse.save_tables()
+    try:
+        warehouse = DataWarehouse()
+        with span("warehouse.main"):
+            warehouse.process_job_details()
+            warehouse.save_tables()
+        with span("warehouse.skill_analytics"):
+            added = analytics.update_from_warehouse(warehouse.wh_path)
+        print(f"📈 Analítica de habilidades: {added} trabajos nuevos")
+        with span("warehouse.trend_cube"):
+            added = trend_cube.update_from_warehouse(warehouse.wh_path)
+        print(f"📅 Cubo de tendencias: {added} trabajos nuevos")
+    finally:
+        # También si la carga falla, que es cuando más importan las métricas
+        write_prometheus_textfile("warehouse")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
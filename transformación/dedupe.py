@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import unicodedata
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+from config.dedupe import (
+    DEDUPE_INDEX_PATH, NUM_PERM, LSH_BANDS, SIMILARITY_THRESHOLD, SHINGLE_SIZE, SEED
+)
+
+# Primo mayor que 2**32: (a * h + b) cabe en uint64 sin desbordar
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(2**32 - 1)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9+#]+")
+_JOB_ID = re.compile(r"/jobs/view/(?:[^/?]*-)?(\d+)")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Minúsculas, sin tildes ni puntuación y con espacios colapsados"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+def job_key_from_link(link: Optional[str]) -> Optional[str]:
+    """Devuelve el ID numérico de LinkedIn o, si no lo hay, el link completo"""
+    if not link:
+        return None
+    match = _JOB_ID.search(link)
+    return match.group(1) if match else link
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = text.split()
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+class NearDuplicateIndex:
+    """Índice MinHash/LSH persistido en disco para detectar ofertas casi duplicadas"""
+
+    def __init__(self, path: str = DEDUPE_INDEX_PATH, num_perm: int = NUM_PERM,
+                 bands: int = LSH_BANDS, threshold: float = SIMILARITY_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError("num_perm debe ser múltiplo de bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+
+        rng = np.random.RandomState(SEED)
+        self._a = rng.randint(1, 2**32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2**32, size=num_perm, dtype=np.uint64)
+
+        self.entries = []  # metadatos por firma: job_key, cluster_id, analysis
+        self._keys = set()  # job_key de las entradas, una firma por trabajo
+        self._storage = np.empty((0, num_perm), dtype=np.uint64)
+        self.buckets = [dict() for _ in range(bands)]
+        self._saved = 0  # entradas que ya están en disco
+        self._disk_version = None
+        self._load()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self):
+        version = self._stat()
+        if version is None:
+            return
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        self._disk_version = version
+        if state["num_perm"] != self.num_perm or state["bands"] != self.bands:
+            print("⚠️  Parámetros del índice de duplicados cambiaron, se reconstruirá desde cero.")
+            return
+        self.entries = state["entries"]
+        self._storage = state["signatures"]
+        self.buckets = state["buckets"]
+        self._keys = {entry["job_key"] for entry in self.entries}
+        self._saved = len(self.entries)
+
+    def reload(self):
+        """Relee el índice si otro proceso lo guardó, conservando las entradas aún no guardadas"""
+        if self._stat() == self._disk_version:
+            return
+        pending = [(entry, self._storage[i]) for i, entry in enumerate(self.entries[self._saved:], self._saved)]
+        self.entries = []
+        self._keys = set()
+        self._storage = np.empty((0, self.num_perm), dtype=np.uint64)
+        self.buckets = [dict() for _ in range(self.bands)]
+        self._saved = 0
+        self._load()
+        for entry, signature in pending:
+            self.add(entry["job_key"], signature, entry["cluster_id"], entry["analysis"])
+
+    @contextmanager
+    def locked(self):
+        """Bloqueo exclusivo entre procesos sobre el índice, ya sincronizado con el disco
+
+        Los workers del pool comparten el archivo: consultar con el índice al día y
+        agregar + guardar dentro del bloqueo evita que el último `save` pise las
+        entradas de los demás.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.reload()
+            yield self
+
+    @property
+    def signatures(self) -> np.ndarray:
+        return self._storage[:len(self.entries)]
+
+    def save(self):
+        """Guarda el índice de forma atómica (entre procesos, llamar dentro de `locked`)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "entries": self.entries,
+                "signatures": self.signatures,
+                "buckets": self.buckets,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._saved = len(self.entries)
+        self._disk_version = self._stat()
+
+    def signature(self, title: Optional[str], description: Optional[str]) -> Optional[np.ndarray]:
+        """Firma MinHash del título y la descripción normalizados"""
+        hashes = _shingle_hashes(normalize_text(f"{title or ''} {description or ''}"))
+        if not hashes.size:
+            return None
+        # Matriz permutaciones x shingles, se queda con el mínimo de cada permutación
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _PRIME & _MAX_HASH
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, signature: np.ndarray, exclude: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Devuelve la entrada más parecida por encima del umbral, con su similitud estimada
+
+        `exclude` es el job_key del propio trabajo: al reprocesarlo no debe encontrarse a sí mismo.
+        """
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self.buckets[band].get(key, ()))
+        if exclude is not None:
+            candidates = {i for i in candidates if self.entries[i]["job_key"] != exclude}
+        if not candidates:
+            return None
+
+        idx = np.fromiter(candidates, dtype=np.int64)
+        similarity = (self.signatures[idx] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] < self.threshold:
+            return None
+        return {**self.entries[idx[best]], "similarity": float(similarity[best])}
+
+    def add(self, job_key: str, signature: np.ndarray, cluster_id: str, analysis: Optional[str] = None):
+        """Agrega una firma al índice si el trabajo no está ya (no guarda en disco, ver `save`)"""
+        if job_key in self._keys:
+            return
+        position = len(self.entries)
+        if position == len(self._storage):
+            # Crece al doble para que agregar firmas sea O(1) amortizado
+            grown = np.empty((max(64, 2 * position), self.num_perm), dtype=np.uint64)
+            grown[:position] = self._storage
+            self._storage = grown
+        self._storage[position] = signature
+        self.entries.append({"job_key": job_key, "cluster_id": cluster_id, "analysis": analysis})
+        self._keys.add(job_key)
+        for band, key in self._band_keys(signature):
+            self.buckets[band].setdefault(key, []).append(position)
+
+
+_index = None
+
+
+def get_index() -> NearDuplicateIndex:
+    """Índice compartido por el proceso, cargado desde disco la primera vez"""
+    global _index
+    if _index is None:
+        _index = NearDuplicateIndex()
+    return _index
+
+
+def load_analysis(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Carga el análisis guardado de una entrada del índice, sin sus campos de identidad"""
+    if not entry:
+        return None
+    from transformación.segment_store import get_store
+
+    path = entry.get("analysis")
+    if path and os.path.exists(path):
+        # Entradas anteriores al store segmentado apuntan a un archivo JSON
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        # Lectura directa en el offset guardado; el índice completo solo si no hay ubicación
+        store = get_store()
+        data = store.read_at(path) or store.get(entry["job_key"])
+        if data is None:
+            return None
+    for key in ("job_key", "cluster_id", "duplicado_de"):
+        data.pop(key, None)
+    return data
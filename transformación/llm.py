@@ -0,0 +1,52 @@
+import time
+from openai import OpenAI
+from langchain_core.language_models import BaseLLM
+from langchain_core.outputs import LLMResult, Generation
+from config.api_keys import API_KEY
+from monitoreo.metrics import LLM_TOKENS, LLM_LATENCY_SECONDS, FAILURES, LLM_FAILURES
+
+class OpenRouteLLM(BaseLLM):
+    base_url: str = "https://openrouter.ai/api/v1"
+    model: str = "deepseek/deepseek-r1-distill-llama-70b"
+
+    @property
+    def _llm_type(self) -> str:
+        return "openroute"
+
+    def _call(self, prompt: str, **kwargs) -> str:
+        return self._generate([prompt], **kwargs).generations[0][0].text
+
+    def _generate(self, prompts: list[str], **kwargs) -> LLMResult:
+        client = OpenAI(
+            base_url=self.base_url,
+            api_key=API_KEY
+        )
+        
+        results = []
+        for prompt in prompts:
+            start = time.perf_counter()
+            try:
+                completion = client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ]
+                )
+            except Exception:
+                FAILURES.inc(stage="llm")
+                LLM_FAILURES.inc(model=self.model)
+                raise
+            finally:
+                LLM_LATENCY_SECONDS.observe(time.perf_counter() - start, model=self.model)
+
+            if completion.usage:
+                LLM_TOKENS.inc(completion.usage.prompt_tokens, model=self.model, kind="prompt")
+                LLM_TOKENS.inc(completion.usage.completion_tokens, model=self.model, kind="completion")
+            
+            text = completion.choices[0].message.content
+            results.append([Generation(text=text)])
+        
+        return LLMResult(generations=results)
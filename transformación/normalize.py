@@ -0,0 +1,164 @@
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Fechas relativas: "hace 3 días", "2 weeks ago", "Publicado hace una hora", "Reposted 5 days ago"
+_RELATIVE = re.compile(
+    r"\b(?P<num>\d+|una?|an?|one)\s+"
+    r"(?P<unit>minutos?|mins?|minutes?|horas?|hours?|hrs?|d[ií]as?|days?|semanas?|weeks?"
+    r"|mes(?:es)?|months?|a[ñn]os?|years?)",
+    re.IGNORECASE,
+)
+_TODAY = re.compile(r"\b(?:hoy|today|just now|ahora)\b", re.IGNORECASE)
+_YESTERDAY = re.compile(r"\b(?:ayer|yesterday)\b", re.IGNORECASE)
+_ISO_DATE = re.compile(r"(\d{4}-\d{2}-\d{2})")
+_DMY_DATE = re.compile(r"(\d{1,2}/\d{1,2}/\d{4})")
+
+_UNIT_SECONDS = {
+    "min": 60,
+    "hor": 3600, "hou": 3600, "hrs": 3600, "hr": 3600,
+    "día": 86400, "dia": 86400, "day": 86400,
+    "sem": 604800, "wee": 604800,
+    "mes": 30 * 86400, "mon": 30 * 86400,
+    "año": 365 * 86400, "ano": 365 * 86400, "yea": 365 * 86400,
+}
+
+# Salarios: "S/ 3,500 - 4,500 mensuales", "USD 80k-100k per year", "$25/hour", "3000 soles"
+# Un monto solo cuenta pegado a una moneda o a una palabra de salario ("Entre 2 y 3 años" no lo es)
+_CURRENCY_TOKENS = r"S/\.?|PEN|soles?|US\$|USD|d[oó]lares|EUR|€|euros?|MXN|COP|CLP|ARS|\$"
+_SALARY_WORDS = r"salario|sueldo|remuneraci[oó]n|compensaci[oó]n|salary|compensation|\bpay\b"
+_AMOUNT = (
+    r"(?P<min>\d[\d.,]*)\s*(?P<kmin>[kK]\b)?"
+    r"(?:\s*(?:-|–|\ba\b|\bto\b|hasta|\by\b)\s*\D{0,5}?(?P<max>\d[\d.,]*)\s*(?P<kmax>[kK]\b)?)?"
+)
+# El contexto del periodo termina en el siguiente número: "mensuales por 48 horas" no es por hora
+_SALARY_LEADING = re.compile(
+    rf"(?P<lead>(?:{_CURRENCY_TOKENS}|{_SALARY_WORDS})\D{{0,20}}?){_AMOUNT}(?P<tail>\D{{0,20}})", re.IGNORECASE
+)
+_SALARY_TRAILING = re.compile(rf"{_AMOUNT}\s*(?P<lead>{_CURRENCY_TOKENS})(?P<tail>\D{{0,20}})", re.IGNORECASE)
+_CURRENCY = re.compile(rf"({_CURRENCY_TOKENS})", re.IGNORECASE)
+_CURRENCY_CODES = {
+    "s/": "PEN", "s/.": "PEN", "pen": "PEN", "sol": "PEN", "soles": "PEN",
+    "us$": "USD", "usd": "USD", "dolares": "USD", "dólares": "USD", "$": "USD",
+    "eur": "EUR", "€": "EUR", "euro": "EUR", "euros": "EUR",
+    "mxn": "MXN", "cop": "COP", "clp": "CLP", "ars": "ARS",
+}
+# En orden de prioridad: los periodos largos ganan si aparecen varios junto al monto
+_PERIODS = [
+    ("mensual", re.compile(r"mensual|\bmes\b|month|/\s*mo\b", re.IGNORECASE)),
+    ("anual", re.compile(r"anual|\ba[ñn]o\b|year|annual|/\s*yr\b", re.IGNORECASE)),
+    ("diario", re.compile(r"diari|por d[ií]a|daily|per day|/\s*d[ií]a", re.IGNORECASE)),
+    ("hora", re.compile(r"hora|hour|/\s*hr\b|/\s*h\b", re.IGNORECASE)),
+]
+_THOUSANDS = re.compile(r"^(?P<int>\d{1,3}(?:[.,]\d{3})+)(?:[.,](?P<dec>\d{1,2}))?$")
+
+_APPLICANTS = re.compile(r"(\d[\d.,]*)")
+
+
+def _relative_seconds(text: pd.Series) -> pd.Series:
+    """Segundos hacia atrás que expresa cada texto relativo (NaN si no es relativo)"""
+    parts = text.str.extract(_RELATIVE)
+    num = parts["num"].str.lower()
+    num = pd.to_numeric(num.mask(num.isin(["un", "una", "a", "an", "one"]), "1"), errors="coerce")
+    unit = parts["unit"].str.lower().str[:3].map(_UNIT_SECONDS)
+    seconds = num * unit
+    seconds = seconds.mask(seconds.isna() & text.str.contains(_TODAY, na=False), 0)
+    seconds = seconds.mask(seconds.isna() & text.str.contains(_YESTERDAY, na=False), 86400)
+    return seconds
+
+
+def normalize_dates(text: pd.Series, anchor: Optional[pd.Series] = None) -> pd.Series:
+    """Convierte una columna de fechas relativas o absolutas en timestamps
+
+    Las relativas se anclan a `anchor` (la hora de extracción de cada fila) o, si
+    falta, al momento actual.
+    """
+    text = text.astype("string")
+    now = pd.Timestamp(datetime.now())
+    if anchor is None:
+        anchor = pd.Series(now, index=text.index)
+    else:
+        anchor = pd.to_datetime(anchor, errors="coerce").fillna(now)
+
+    result = anchor - pd.to_timedelta(_relative_seconds(text), unit="s")
+
+    iso = pd.to_datetime(text.str.extract(_ISO_DATE, expand=False), format="%Y-%m-%d", errors="coerce")
+    dmy = pd.to_datetime(text.str.extract(_DMY_DATE, expand=False), format="%d/%m/%Y", errors="coerce")
+    return result.fillna(iso).fillna(dmy)
+
+
+def _to_number(value: pd.Series, thousand_suffix: pd.Series) -> pd.Series:
+    grouped = value.str.extract(_THOUSANDS)
+    plain = value.str.replace(",", ".", regex=False)
+    with_groups = grouped["int"].str.replace(r"[.,]", "", regex=True) + "." + grouped["dec"].fillna("0")
+    number = pd.to_numeric(with_groups.fillna(plain), errors="coerce")
+    return number * np.where(thousand_suffix.notna(), 1000, 1)
+
+
+def normalize_salaries(text: pd.Series) -> pd.DataFrame:
+    """Separa una columna de salarios en mínimo, máximo, moneda y periodo
+
+    Solo se toman montos precedidos por una moneda o palabra de salario, o seguidos
+    de una moneda; el periodo se busca junto al monto, no en todo el texto.
+    """
+    text = text.astype("string")
+    leading = text.str.extract(_SALARY_LEADING)
+    trailing = text.str.extract(_SALARY_TRAILING)
+    parts = leading.where(leading["min"].notna(), trailing[leading.columns])
+    salario_min = _to_number(parts["min"], parts["kmin"])
+    salario_max = _to_number(parts["max"], parts["kmax"].fillna(parts["kmin"]))
+    found = salario_min.notna()
+
+    # Moneda junto al monto o, con una palabra de salario, en cualquier parte del texto
+    currency = parts["lead"].str.extract(_CURRENCY, expand=False)
+    currency = currency.fillna(text.str.extract(_CURRENCY, expand=False)).str.lower()
+    context = parts["lead"].fillna("") + " " + parts["tail"].fillna("")
+    period = pd.Series(np.select(
+        [context.str.contains(pattern, na=False) for _, pattern in _PERIODS],
+        [name for name, _ in _PERIODS],
+        default="",
+    ), index=text.index).replace("", None)
+
+    return pd.DataFrame({
+        "salario_min": salario_min,
+        "salario_max": salario_max.fillna(salario_min),
+        "salario_moneda": currency.map(_CURRENCY_CODES).where(found),
+        "salario_periodo": period.where(found),
+    }, index=text.index)
+
+
+def normalize_applicants(text: pd.Series) -> pd.Series:
+    """Extrae el número de postulantes de textos como "Más de 200 solicitantes" """
+    digits = text.astype("string").str.extract(_APPLICANTS, expand=False).str.replace(r"[.,]", "", regex=True)
+    return pd.to_numeric(digits, errors="coerce").astype("Int64")
+
+
+def normalize_principal(df: pd.DataFrame) -> pd.DataFrame:
+    """Agrega a un bloque de la tabla principal las columnas tipadas de fecha, salario y postulantes"""
+    anchor = df["fecha_extraccion"] if "fecha_extraccion" in df else None
+    posted = normalize_dates(df["posted_date"], anchor) if "posted_date" in df else None
+    published = normalize_dates(df["fecha_publicacion"], anchor)
+    # La fecha del scraper es más precisa que la que devuelve el LLM
+    df["fecha_publicacion_ts"] = posted.fillna(published) if posted is not None else published
+    df = df.join(normalize_salaries(df["salario_estimado"]))
+    if "applicants" in df:
+        df["num_postulantes"] = normalize_applicants(df["applicants"])
+    return df
+
+
+def parse_relative_date(text: Optional[str], anchor: Optional[datetime] = None) -> datetime:
+    """Versión escalar de `normalize_dates` para un solo texto relativo de LinkedIn"""
+    anchor = anchor or datetime.now()
+    if not text:
+        return anchor
+    match = _RELATIVE.search(text)
+    if match:
+        num = match.group("num").lower()
+        num = 1 if num in ("un", "una", "a", "an", "one") else int(num)
+        return anchor - timedelta(seconds=num * _UNIT_SECONDS[match.group("unit").lower()[:3]])
+    if _YESTERDAY.search(text):
+        return anchor - timedelta(days=1)
+    return anchor
@@ -0,0 +1,140 @@
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+from config.search import SEARCH_DB_PATH, SEARCH_LIMIT
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    rowid INTEGER PRIMARY KEY,
+    job_key TEXT UNIQUE NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    country TEXT,
+    posted_at TEXT,
+    link TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_country ON jobs(country);
+CREATE INDEX IF NOT EXISTS jobs_company ON jobs(company);
+CREATE INDEX IF NOT EXISTS jobs_posted_at ON jobs(posted_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, description, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    # WAL permite que los workers del pool escriban mientras el dashboard consulta
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _posted_at(job_details: Dict) -> Optional[str]:
+    """Fecha ISO de publicación: la de la tarjeta de búsqueda o la relativa del detalle"""
+    if job_details.get("posted"):
+        return str(job_details["posted"])[:10]
+    if job_details.get("posted_date"):
+        from transformación.normalize import parse_relative_date
+        fetched = job_details.get("fetched_at")
+        anchor = datetime.fromisoformat(fetched) if fetched else None
+        return parse_relative_date(job_details["posted_date"], anchor).date().isoformat()
+    return None
+
+
+def index_job(job_key: str, job_details: Dict, db_path: str = SEARCH_DB_PATH):
+    """Agrega o reemplaza una publicación en el índice de texto completo"""
+    if not job_key or not job_details.get("description"):
+        return
+    with _connect(db_path) as conn:
+        row = conn.execute("SELECT rowid FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+        values = (
+            job_details.get("title"), job_details.get("company"), job_details.get("location"),
+            job_details.get("country"), _posted_at(job_details), job_details.get("link"),
+        )
+        if row:
+            rowid = row["rowid"]
+            conn.execute(
+                "UPDATE jobs SET title=?, company=?, location=?, country=?, posted_at=?, link=? WHERE rowid=?",
+                (*values, rowid),
+            )
+            conn.execute("DELETE FROM jobs_fts WHERE rowid = ?", (rowid,))
+        else:
+            rowid = conn.execute(
+                "INSERT INTO jobs (job_key, title, company, location, country, posted_at, link) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_key, *values),
+            ).lastrowid
+        conn.execute(
+            "INSERT INTO jobs_fts (rowid, title, description) VALUES (?, ?, ?)",
+            (rowid, job_details.get("title") or "", job_details["description"]),
+        )
+    conn.close()
+
+
+def _as_list(value: Union[str, Sequence[str], None]) -> List[str]:
+    if value is None:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _safe_query(query: str) -> str:
+    """Convierte texto libre en una consulta FTS5 válida (AND de términos entre comillas)"""
+    return " ".join(f'"{token}"' for token in _TOKEN.findall(query))
+
+
+def search(query: str, country: Union[str, Sequence[str], None] = None,
+           company: Union[str, Sequence[str], None] = None,
+           date_from: Optional[str] = None, date_to: Optional[str] = None,
+           limit: int = SEARCH_LIMIT, offset: int = 0, db_path: str = SEARCH_DB_PATH) -> List[Dict]:
+    """Búsqueda rankeada (bm25) por palabras clave o frases entre comillas, con filtros opcionales
+
+    `query` acepta la sintaxis de FTS5 ("data engineer", spark AND aws, pyth*); si no
+    es válida se busca cada palabra por separado.
+    """
+    if not query or not query.strip() or not os.path.exists(db_path):
+        return []
+
+    filters, params = [], []
+    countries, companies = _as_list(country), _as_list(company)
+    if countries:
+        filters.append(f"j.country IN ({', '.join('?' * len(countries))})")
+        params.extend(countries)
+    if companies:
+        filters.append(f"j.company IN ({', '.join('?' * len(companies))})")
+        params.extend(companies)
+    if date_from:
+        filters.append("j.posted_at >= ?")
+        params.append(str(date_from)[:10])
+    if date_to:
+        filters.append("j.posted_at <= ?")
+        params.append(str(date_to)[:10])
+    where = "".join(f" AND {f}" for f in filters)
+
+    sql = f"""
+        SELECT j.job_key, j.title, j.company, j.location, j.country, j.posted_at, j.link,
+               snippet(jobs_fts, 1, '[', ']', '…', 16) AS fragmento,
+               bm25(jobs_fts, 5.0, 1.0) AS score
+        FROM jobs_fts JOIN jobs j ON j.rowid = jobs_fts.rowid
+        WHERE jobs_fts MATCH ?{where}
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    """
+    conn = _connect(db_path)
+    try:
+        try:
+            rows = conn.execute(sql, (query, *params, limit, offset)).fetchall()
+        except sqlite3.OperationalError:
+            safe = _safe_query(query)
+            rows = conn.execute(sql, (safe, *params, limit, offset)).fetchall() if safe else []
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
@@ -0,0 +1,150 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+from config.storage import DETAILS_STORE_DIR, MAX_SEGMENT_BYTES
+
+_SEGMENT = re.compile(r"^segment_(\d{6})\.jsonl$")
+_LOCATION = re.compile(r"^segment_(\d{6})\.jsonl:(\d+)$")
+
+
+class SegmentStore:
+    """Log append-only de registros JSON por job_key, repartido en segmentos por tamaño
+
+    Cada registro es una línea de `segment_NNNNNN.jsonl`; su posición se anota en
+    `segment_NNNNNN.idx` (offset, largo, job_key) solo después de escribir y
+    sincronizar los datos, así que un registro a medio escribir nunca queda indexado.
+    Un job_key repetido se resuelve a su último registro.
+    """
+
+    def __init__(self, root: str = DETAILS_STORE_DIR, max_segment_bytes: int = MAX_SEGMENT_BYTES):
+        self.root = root
+        self.max_segment_bytes = max_segment_bytes
+        self._index: Optional[Dict[str, Tuple[int, int, int]]] = None
+        os.makedirs(root, exist_ok=True)
+
+    def _segment_path(self, number: int, ext: str = "jsonl") -> str:
+        return os.path.join(self.root, f"segment_{number:06d}.{ext}")
+
+    def segments(self):
+        """Números de segmento existentes, en orden de escritura"""
+        numbers = []
+        for name in os.listdir(self.root):
+            match = _SEGMENT.match(name)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def append(self, job_key: str, data: Dict[str, Any]) -> str:
+        """Agrega un registro y devuelve su ubicación `segment_NNNNNN.jsonl:offset`"""
+        line = json.dumps(
+            {"job_key": job_key, "saved_at": datetime.now().isoformat(), "data": data},
+            ensure_ascii=False,
+        ).encode("utf-8") + b"\n"
+
+        with open(os.path.join(self.root, "store.lock"), "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            segments = self.segments()
+            number = segments[-1] if segments else 1
+            path = self._segment_path(number)
+            if os.path.exists(path) and os.path.getsize(path) + len(line) > self.max_segment_bytes:
+                number += 1
+                path = self._segment_path(number)
+
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                offset = os.fstat(fd).st_size
+                # Cierra una línea truncada por una caída previa para no pegarle este registro
+                if offset and os.pread(fd, 1, offset - 1) != b"\n":
+                    os.write(fd, b"\n")
+                    offset += 1
+                os.write(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+            with open(self._segment_path(number, "idx"), "a", encoding="utf-8") as idx:
+                idx.write(f"{offset}\t{len(line)}\t{job_key}\n")
+                idx.flush()
+                os.fsync(idx.fileno())
+
+        if self._index is not None:
+            self._index[job_key] = (number, offset, len(line))
+        return f"{os.path.basename(path)}:{offset}"
+
+    def load_index(self) -> Dict[str, Tuple[int, int, int]]:
+        """job_key -> (segmento, offset, largo) de su registro más reciente"""
+        index = {}
+        for number in self.segments():
+            idx_path = self._segment_path(number, "idx")
+            if not os.path.exists(idx_path):
+                continue
+            with open(idx_path, "r", encoding="utf-8") as f:
+                for entry in f:
+                    parts = entry.rstrip("\n").split("\t", 2)
+                    if len(parts) == 3:
+                        index[parts[2]] = (number, int(parts[0]), int(parts[1]))
+        return index
+
+    def get(self, job_key: str, index: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """Lectura puntual del último registro de un job_key
+
+        El índice se carga una vez y se mantiene con cada `append`; solo se relee
+        si el job_key no aparece, por si lo escribió otro proceso.
+        """
+        if index is None:
+            if self._index is None or job_key not in self._index:
+                self._index = self.load_index()
+            index = self._index
+        location = index.get(job_key)
+        if not location:
+            return None
+        number, offset, length = location
+        with open(self._segment_path(number), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["data"]
+
+    def read_at(self, location: str) -> Optional[Dict[str, Any]]:
+        """Lee el registro en una ubicación `segment_NNNNNN.jsonl:offset` devuelta por `append`"""
+        match = _LOCATION.match(location or "")
+        if not match:
+            return None
+        path = self._segment_path(int(match.group(1)))
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            f.seek(int(match.group(2)))
+            return json.loads(f.readline())["data"]
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Recorre los segmentos secuencialmente devolviendo (job_key, data) del último registro de cada job"""
+        latest = {(number, offset) for number, offset, _ in self.load_index().values()}
+
+        for number in self.segments():
+            offset = 0
+            with open(self._segment_path(number), "rb", buffering=1024 * 1024) as f:
+                for line in f:
+                    if (number, offset) in latest:
+                        record = json.loads(line)
+                        yield record["job_key"], record["data"]
+                    offset += len(line)
+
+
+_store = None
+
+
+def get_store() -> SegmentStore:
+    """Store compartido por el proceso"""
+    global _store
+    if _store is None:
+        _store = SegmentStore()
+    return _store
@@ -0,0 +1,100 @@
+import difflib
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.technologies import TECHNOLOGY_ALIASES, FUZZY_CUTOFF
+
+NO_ESPECIFICA = "No se especifica"
+
+_PARENS = re.compile(r"\(([^)]*)\)")
+_SEPARATORS = re.compile(r"[^a-z0-9+#/.]+")
+
+
+def as_text(value: Any) -> Optional[str]:
+    """Texto de una tecnología tal como la devuelve el LLM: números a str, listas unidas por comas"""
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(item) for item in value if item is not None) or None
+    return str(value)
+
+
+def fold(text: Optional[str]) -> str:
+    """Minúsculas, sin tildes y con separadores colapsados"""
+    text = as_text(text)
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _SEPARATORS.sub(" ", text).strip(" ./")
+
+
+class TechnologyIndex:
+    """Índice de alias plegados -> ID canónico de tecnología
+
+    Los IDs de las tecnologías conocidas salen del orden de TECHNOLOGY_ALIASES; las
+    desconocidas reciben IDs nuevos a continuación. Cada texto distinto se resuelve
+    una sola vez y el resultado queda en caché.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]] = TECHNOLOGY_ALIASES, fuzzy_cutoff: float = FUZZY_CUTOFF):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.names = [None]  # ID 0 reservado para "No se especifica"
+        self.known = [True]
+        self._lookup = {}
+        for canonical, alias_list in aliases.items():
+            tech_id = len(self.names)
+            self.names.append(canonical)
+            self.known.append(True)
+            for alias in [canonical, *alias_list]:
+                self._lookup.setdefault(fold(alias), tech_id)
+        self._known_keys = list(self._lookup)
+        self._cache = {}
+
+    def _resolve(self, text: Optional[str]) -> int:
+        folded = fold(text)
+        if not folded or text == NO_ESPECIFICA:
+            return 0
+
+        # Variantes: texto completo, sin paréntesis y el contenido de los paréntesis
+        candidates = [folded]
+        if "(" in text:
+            candidates.append(fold(_PARENS.sub(" ", text)))
+            candidates.extend(fold(inner) for inner in _PARENS.findall(text))
+        for candidate in candidates:
+            if candidate in self._lookup:
+                return self._lookup[candidate]
+
+        match = difflib.get_close_matches(folded, self._known_keys, n=1, cutoff=self.fuzzy_cutoff)
+        if match:
+            tech_id = self._lookup[match[0]]
+        else:
+            tech_id = len(self.names)
+            self.names.append(text.strip())
+            self.known.append(False)
+        # Las próximas apariciones de la misma forma plegada no pasan por difflib
+        self._lookup[folded] = tech_id
+        return tech_id
+
+    def canonicalize(self, values: Iterable[Any]) -> List[int]:
+        """Convierte una columna de tecnologías en IDs canónicos, resolviendo cada valor distinto una vez"""
+        cache = self._cache
+        ids = []
+        for value in values:
+            value = as_text(value)
+            tech_id = cache.get(value)
+            if tech_id is None:
+                tech_id = cache[value] = self._resolve(value)
+            ids.append(tech_id)
+        return ids
+
+    def name(self, tech_id: int) -> str:
+        return self.names[tech_id] or NO_ESPECIFICA
+
+    def dimension(self) -> List[Dict]:
+        """Filas de la tabla de dimensión de tecnologías"""
+        return [
+            {"tecnologia_id": tech_id, "tecnologia": self.name(tech_id), "conocida": self.known[tech_id]}
+            for tech_id in range(len(self.names))
+        ]
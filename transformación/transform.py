@@ -1,50 +1,13 @@
 from datetime import datetime
-import pandas as pd
 import os
 import json
-from openai import OpenAI
-from langchain_core.language_models import BaseLLM
-from langchain_core.outputs import LLMResult, Generation
-from config.api_keys import API_KEY
-
-class OpenRouteLLM(BaseLLM):
-    base_url: str = "https://openrouter.ai/api/v1"
-    model: str = "deepseek/deepseek-r1-distill-llama-70b"
-
-    @property
-    def _llm_type(self) -> str:
-        return "openroute"
-
-    def _call(self, prompt: str, **kwargs) -> str:
-        return self._generate([prompt], **kwargs).generations[0][0].text
-
-    def _generate(self, prompts: list[str], **kwargs) -> LLMResult:
-        client = OpenAI(
-            base_url=self.base_url,
-            api_key=API_KEY
-        )
-        
-        results = []
-        for prompt in prompts:
-            completion = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            
-            text = completion.choices[0].message.content
-            results.append([Generation(text=text)])
-        
-        return LLMResult(generations=results)
-
-from langchain.prompts import ChatPromptTemplate
 
 def analyze_job_description(description):
     """Analyze job description using DeepSeek API"""
+    # openai, langchain y la API key solo se cargan cuando realmente se llama al LLM
+    from langchain.prompts import ChatPromptTemplate
+    from transformación.llm import OpenRouteLLM
+
     chat = OpenRouteLLM()
     
     prompt_template = ChatPromptTemplate.from_template("""
@@ -184,4 +147,14 @@ def save_to_json(data, filename_prefix="jobs"):
     os.makedirs("./data/job_details", exist_ok=True)
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
-    return filename
\ No newline at end of file
+    return filename
+
+def save_to_store(data):
+    """Append JSON data to the segmented job details store, keyed by job_key"""
+    if not data:
+        print("No data to save")
+        return None
+
+    from transformación.segment_store import get_store
+    job_key = data.get("job_key") or datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return get_store().append(job_key, data)
@@ -0,0 +1,217 @@
+import os
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from config.trends import TREND_CUBE_PATH
+from transformación.warehouse_reader import iter_job_batches, job_keys
+
+NO_ESPECIFICA = "No se especifica"
+DIMENSIONS = ["pais", "categoria", "nivel_puesto"]
+# Cambia cuando cambia cómo se identifican los trabajos; un cubo de otra versión se reconstruye
+CUBE_VERSION = 2
+
+# 1970-01-01 fue jueves: (días + 3) // 7 numera semanas que empiezan en lunes
+_EPOCH_SHIFT = 3
+
+Filter = Optional[Union[str, Sequence[str]]]
+
+
+def _week_numbers(timestamps: pd.Series) -> np.ndarray:
+    days = pd.to_datetime(timestamps, errors="coerce", format="ISO8601").to_numpy(dtype="datetime64[D]")
+    valid = ~np.isnat(days)
+    weeks = np.full(len(days), -1, dtype=np.int64)
+    weeks[valid] = (days[valid].astype(np.int64) + _EPOCH_SHIFT) // 7
+    return weeks
+
+
+def _week_start(week: np.ndarray) -> pd.DatetimeIndex:
+    return pd.to_datetime(week * 7 - _EPOCH_SHIFT, unit="D")
+
+
+class TrendCube:
+    """Conteos semanales de trabajos por país, categoría de requerimiento y nivel de puesto
+
+    Dos arreglos densos de NumPy con la semana como primer eje:
+
+    - `jobs[semana, pais, nivel]`: trabajos publicados.
+    - `requirements[semana, pais, categoria, nivel]`: trabajos que piden al menos
+      un requerimiento de la categoría (`tipo_requerimiento`).
+
+    Los ejes crecen con ceros cuando aparecen semanas o valores nuevos y cada
+    trabajo (por `warehouse_reader.job_keys`) se suma una sola vez, así cada carga del warehouse
+    solo agrega lo nuevo. Un año con decenas de valores por eje ocupa unos pocos
+    cientos de KB y cualquier corte es una suma sobre ejes.
+    """
+
+    def __init__(self, path: str = TREND_CUBE_PATH):
+        self.path = path
+        self.origin = 0  # número de semana del índice 0
+        self.values: Dict[str, List[str]] = {dim: [] for dim in DIMENSIONS}
+        self._index: Dict[str, Dict[str, int]] = {dim: {} for dim in DIMENSIONS}
+        self.jobs = np.zeros((0, 0, 0), dtype=np.int32)
+        self.requirements = np.zeros((0, 0, 0, 0), dtype=np.int32)
+        self.keys = set()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with np.load(self.path, allow_pickle=False) as state:
+            if "version" not in state or int(state["version"]) != CUBE_VERSION:
+                print("⚠️  Formato del cubo de tendencias cambió, se reconstruirá desde cero.")
+                return
+            self.origin = int(state["origin"])
+            self.jobs = state["jobs"]
+            self.requirements = state["requirements"]
+            self.keys = set(state["keys"].tolist())
+            for dim in DIMENSIONS:
+                self.values[dim] = state[dim].tolist()
+                self._index[dim] = {value: i for i, value in enumerate(self.values[dim])}
+
+    def save(self):
+        """Guarda el cubo comprimido y de forma atómica"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(
+                f,
+                version=np.int64(CUBE_VERSION),
+                origin=np.int64(self.origin),
+                jobs=self.jobs,
+                requirements=self.requirements,
+                keys=np.array(sorted(self.keys), dtype=str),
+                **{dim: np.array(self.values[dim], dtype=str) for dim in DIMENSIONS},
+            )
+        os.replace(tmp_path, self.path)
+
+    @property
+    def weeks(self) -> pd.DatetimeIndex:
+        return _week_start(self.origin + np.arange(self.jobs.shape[0]))
+
+    def _encode(self, dim: str, values: pd.Series) -> np.ndarray:
+        index, known = self._index[dim], self.values[dim]
+        codes = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values.fillna(NO_ESPECIFICA).astype(str)):
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(known)
+                known.append(value)
+            codes[i] = code
+        return codes
+
+    def _grow(self, first_week: int, last_week: int):
+        """Amplía los arreglos a las semanas y valores conocidos, rellenando con ceros"""
+        n_weeks = self.jobs.shape[0]
+        if n_weeks == 0:
+            self.origin = first_week
+        before = max(0, self.origin - first_week)
+        after = max(0, last_week - (self.origin + n_weeks - 1)) if n_weeks else last_week - first_week + 1
+        n_pais, n_cat, n_nivel = (len(self.values[dim]) for dim in DIMENSIONS)
+        self.jobs = np.pad(self.jobs, [
+            (before, after), (0, n_pais - self.jobs.shape[1]), (0, n_nivel - self.jobs.shape[2]),
+        ])
+        self.requirements = np.pad(self.requirements, [
+            (before, after), (0, n_pais - self.requirements.shape[1]),
+            (0, n_cat - self.requirements.shape[2]), (0, n_nivel - self.requirements.shape[3]),
+        ])
+        self.origin -= before
+
+    def update(self, principal: pd.DataFrame, requerimientos: pd.DataFrame) -> int:
+        """Suma los trabajos aún no contados; devuelve cuántos se agregaron
+
+        La semana sale de `fecha_publicacion_ts` o, si falta, de `fecha_extraccion`.
+        """
+        if principal.empty:
+            return 0
+        dated = pd.Series(None, index=principal.index, dtype=object)
+        for column in ("fecha_publicacion_ts", "fecha_extraccion"):
+            if column in principal:
+                dated = dated.fillna(principal[column])
+        principal = principal.assign(_key=job_keys(principal), _week=_week_numbers(dated))
+        principal = principal[
+            principal["_key"].notna() & (principal["_week"] >= 0) & ~principal["_key"].isin(self.keys)
+        ].drop_duplicates("_key")
+        if principal.empty:
+            return 0
+
+        pais = self._encode("pais", principal["pais"] if "pais" in principal else pd.Series(None, index=principal.index))
+        nivel = self._encode("nivel_puesto", principal["nivel_puesto"])
+        week = principal["_week"].to_numpy()
+
+        # Una fila por trabajo y categoría, aunque pida varias tecnologías de la misma
+        reqs = requerimientos[requerimientos["job_id"].isin(principal["job_id"])]
+        reqs = reqs[["job_id", "tipo_requerimiento"]].drop_duplicates()
+        rows = pd.Series(np.arange(len(principal)), index=principal["job_id"].values)
+        row_idx = rows.reindex(reqs["job_id"].values).to_numpy()
+        categoria = self._encode("categoria", reqs["tipo_requerimiento"])
+
+        self._grow(int(week.min()), int(week.max()))
+        w = week - self.origin
+        # add.at acumula índices repetidos, a diferencia de la asignación con +=
+        np.add.at(self.jobs, (w, pais, nivel), 1)
+        np.add.at(self.requirements, (w[row_idx], pais[row_idx], categoria, nivel[row_idx]), 1)
+
+        self.keys.update(principal["_key"].tolist())
+        return len(principal)
+
+    def _selection(self, dim: str, selected: Filter):
+        if selected is None:
+            return slice(None)
+        if isinstance(selected, str):
+            selected = [selected]
+        return [self._index[dim][value] for value in selected if value in self._index[dim]]
+
+    def series(self, pais: Filter = None, categoria: Filter = None, nivel_puesto: Filter = None,
+               weeks: Optional[int] = None) -> pd.Series:
+        """Trabajos por semana para el corte pedido (None = todos los valores del eje)
+
+        Con `categoria` cuenta trabajos que piden esa categoría de requerimiento.
+        """
+        p = self._selection("pais", pais)
+        n = self._selection("nivel_puesto", nivel_puesto)
+        if categoria is None:
+            counts = self.jobs[:, p][:, :, n].sum(axis=(1, 2))
+        else:
+            c = self._selection("categoria", categoria)
+            counts = self.requirements[:, p][:, :, c][:, :, :, n].sum(axis=(1, 2, 3))
+        result = pd.Series(counts, index=self.weeks, name="trabajos")
+        return result.iloc[-weeks:] if weeks else result
+
+    def period_over_period(self, periods: int = 1, **filters) -> pd.DataFrame:
+        """Serie semanal con la variación frente a `periods` semanas antes"""
+        current = self.series(**filters)
+        previous = current.shift(periods)
+        return pd.DataFrame({
+            "trabajos": current,
+            "anterior": previous,
+            "variacion": current - previous,
+            "variacion_pct": (current - previous) / previous.replace(0, np.nan),
+        })
+
+    def breakdown(self, dimension: str, weeks: int = 4, **filters) -> pd.DataFrame:
+        """Compara las últimas `weeks` semanas con las `weeks` anteriores para cada valor de un eje"""
+        rows = []
+        for value in self.values[dimension]:
+            counts = self.series(**{**filters, dimension: value}).to_numpy()
+            actual = int(counts[-weeks:].sum())
+            anterior = int(counts[-2 * weeks:-weeks].sum()) if len(counts) > weeks else 0
+            rows.append({dimension: value, "actual": actual, "anterior": anterior})
+        result = pd.DataFrame(rows, columns=[dimension, "actual", "anterior"])
+        result["variacion"] = result["actual"] - result["anterior"]
+        result["variacion_pct"] = result["variacion"] / result["anterior"].replace(0, np.nan)
+        return result.sort_values("variacion", ascending=False).reset_index(drop=True)
+
+
+def update_from_warehouse(wh_path: str = "data/warehouse") -> int:
+    """Actualiza el cubo persistido con los trabajos nuevos de las tablas del warehouse"""
+    cube = TrendCube()
+    added = 0
+    for principal, requerimientos in iter_job_batches(
+        wh_path, ["fecha_publicacion_ts", "fecha_extraccion", "pais", "nivel_puesto"], ["tipo_requerimiento"]
+    ):
+        added += cube.update(principal, requerimientos)
+    if added:
+        cube.save()
+    return added
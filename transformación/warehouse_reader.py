@@ -0,0 +1,96 @@
+import json
+import os
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config.warehouse import CHUNK_ROWS
+from transformación.dedupe import job_key_from_link
+from transformación.technologies import NO_ESPECIFICA
+
+# Columnas de principal que identifican un trabajo entre cargas, en orden de preferencia
+KEY_COLUMNS = ["cluster_id", "job_key", "link_publicacion"]
+
+
+def _clean(values: pd.Series) -> pd.Series:
+    values = values.astype("string").str.strip()
+    return values.mask(values.isin(["", NO_ESPECIFICA, "None", "nan"]))
+
+
+def job_keys(principal: pd.DataFrame) -> pd.Series:
+    """Clave estable de cada trabajo: cluster_id, job_key o el ID del link de la publicación
+
+    Los valores vacíos o "No se especifica" no son clave; las filas sin ninguna
+    quedan en NA y no se cuentan, en lugar de colapsar en una sola.
+    """
+    key = pd.Series(pd.NA, index=principal.index, dtype="string")
+    for column in ("cluster_id", "job_key"):
+        if column in principal:
+            key = key.fillna(_clean(principal[column]))
+    if "link_publicacion" in principal:
+        links = _clean(principal["link_publicacion"])
+        links = links.where(links.str.contains("://", regex=False, na=False))
+        key = key.fillna(links.map(job_key_from_link, na_action="ignore").astype("string"))
+    return key
+
+
+def _iter_rows(path: str) -> Iterator[dict]:
+    """Filas de un arreglo JSON escrito por ColumnarBuffer.write_json (una fila por línea)"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if line and line not in ("[", "]"):
+                yield json.loads(line)
+
+
+def _frame(rows: List[dict], columns: List[str]) -> pd.DataFrame:
+    return pd.DataFrame([{col: row.get(col) for col in columns} for row in rows], columns=columns)
+
+
+def iter_job_batches(wh_path: str, principal_columns: List[str], requirement_columns: List[str],
+                     chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Recorre principal y requerimientos en bloques alineados por job_id
+
+    Solo se materializan las columnas pedidas y `chunk_rows` trabajos a la vez. Ambas
+    tablas salen del warehouse en orden de job_id, así que los requerimientos de
+    cada bloque se leen en el mismo recorrido secuencial.
+    """
+    principal_path = os.path.join(wh_path, "principal.json")
+    requerimientos_path = os.path.join(wh_path, "requerimientos.json")
+    if not (os.path.exists(principal_path) and os.path.exists(requerimientos_path)):
+        return
+    principal_columns = list(dict.fromkeys(["job_id", *KEY_COLUMNS, *principal_columns]))
+    requirement_columns = list(dict.fromkeys(["job_id", *requirement_columns]))
+
+    requirements = _iter_rows(requerimientos_path)
+    carry: Optional[dict] = None
+    batch: List[dict] = []
+
+    def flush(rows: List[dict]):
+        nonlocal carry
+        last_job = rows[-1]["job_id"]
+        reqs = []
+        if carry is not None and carry["job_id"] <= last_job:
+            reqs.append(carry)
+            carry = None
+        if carry is None:
+            for row in requirements:
+                if row["job_id"] > last_job:
+                    carry = row
+                    break
+                reqs.append(row)
+        return _frame(rows, principal_columns), _frame(reqs, requirement_columns)
+
+    for row in _iter_rows(principal_path):
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield flush(batch)
+            batch = []
+    if batch:
+        yield flush(batch)
+
+
+def read_dimension(wh_path: str, name: str) -> Optional[pd.DataFrame]:
+    """Tabla de dimensión pequeña (p. ej. tecnologias.json), completa"""
+    path = os.path.join(wh_path, f"{name}.json")
+    return pd.read_json(path, dtype=False) if os.path.exists(path) else None
@@ -1,13 +1,60 @@
+import os
+import sys
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Permite importar los paquetes del proyecto al ejecutar el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoreo.profiling import profile_run
+from transformación.analytics import SkillAnalytics
+from transformación.trend_cube import TrendCube
+from config.analytics import SKILLS_MODEL_PATH
+from config.trends import TREND_CUBE_PATH, TREND_WEEKS
+
+
+def model_mtime(path: str):
+    """Fecha de modificación del modelo persistido, o None si aún no existe"""
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+# Los modelos se leen una vez por versión en disco, no en cada rerun de Streamlit;
+# la fecha de modificación es la clave del caché, así una carga nueva del warehouse se ve
+@st.cache_resource(max_entries=1)
+def load_skill_analytics(mtime=None):
+    return SkillAnalytics()
+
+@st.cache_resource(max_entries=1)
+def load_trend_cube(mtime=None):
+    return TrendCube()
+
 # Cargar los datos de las tablas
-actividades_df = pd.read_json('data/warehouse/actividades.json')
-beneficios_df = pd.read_json('data/warehouse/beneficios.json')
-principal_df = pd.read_json('data/warehouse/principal.json')
-requerimientos_df = pd.read_json('data/warehouse/requerimientos.json')
+with profile_run("dashboard.load"):
+    actividades_df = pd.read_json('data/warehouse/actividades.json')
+    beneficios_df = pd.read_json('data/warehouse/beneficios.json')
+    principal_df = pd.read_json('data/warehouse/principal.json')
+    requerimientos_df = pd.read_json('data/warehouse/requerimientos.json')
+    if os.path.exists('data/warehouse/tecnologias.json'):
+        tecnologias_df = pd.read_json('data/warehouse/tecnologias.json')
+        # Filtros y conteos sobre el nombre canónico, no sobre las variantes del LLM
+        requerimientos_df = requerimientos_df.merge(
+            tecnologias_df[['tecnologia_id', 'tecnologia']].rename(columns={'tecnologia': 'tecnologia_canonica'}),
+            on='tecnologia_id', how='left'
+        )
+        requerimientos_df['tecnologia'] = requerimientos_df['tecnologia_canonica'].fillna(requerimientos_df['tecnologia'])
+
+# Las publicaciones casi duplicadas comparten cluster_id; se cuentan una sola vez
+if 'cluster_id' in principal_df.columns:
+    principal_df = pd.concat([
+        principal_df[principal_df['cluster_id'].isna()],
+        principal_df[principal_df['cluster_id'].notna()].drop_duplicates('cluster_id')
+    ])
+    # Las tablas hijas siguen a la publicación que quedó de cada cluster
+    job_ids = principal_df['job_id']
+    actividades_df = actividades_df[actividades_df['job_id'].isin(job_ids)]
+    beneficios_df = beneficios_df[beneficios_df['job_id'].isin(job_ids)]
+    requerimientos_df = requerimientos_df[requerimientos_df['job_id'].isin(job_ids)]
 
 # Configuración inicial
 st.set_page_config(page_title='Dashboard de Oportunidades Laborales', layout='wide')
@@ -91,4 +138,57 @@ with st.spinner('Cargando tabla de requerimientos...'):
     
     # Mostrar tabla
     st.subheader('Resultados filtrados y ordenados')
-    st.dataframe(df, use_container_width=True, height=500)
\ No newline at end of file
+    st.dataframe(df, use_container_width=True, height=500)
+
+# Analítica de habilidades: co-ocurrencia y lift sobre las matrices dispersas precalculadas
+st.header('Analítica de Habilidades')
+skills = load_skill_analytics(model_mtime(SKILLS_MODEL_PATH))
+if not skills.total_jobs:
+    st.info('Aún no hay analítica de habilidades; ejecuta transformación/datawarehouse.py.')
+else:
+    st.caption(f'{skills.total_jobs} trabajos únicos, {len(skills.technologies)} tecnologías')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader('Tecnologías que aparecen juntas')
+        orden_pares = st.selectbox('Ordenar pares por', options=['lift', 'trabajos'])
+        st.dataframe(skills.top_pairs(k=30, by=orden_pares), use_container_width=True)
+    with col2:
+        st.subheader('Habilidades similares')
+        tecnologias = skills.top_technologies(k=len(skills.technologies))['tecnologia']
+        tecnologia = st.selectbox('Tecnología', options=tecnologias)
+        st.dataframe(skills.similar(tecnologia, k=15), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader('Tecnologías por nivel de puesto')
+        nivel = st.selectbox('Nivel de puesto', options=[None] + skills.group_values('nivel_puesto'))
+        st.dataframe(skills.group_lift('nivel_puesto', nivel), use_container_width=True)
+    with col2:
+        st.subheader('Tecnologías por empresa')
+        empresa = st.selectbox('Empresa', options=[None] + skills.group_values('empresa'))
+        st.dataframe(skills.group_lift('empresa', empresa), use_container_width=True)
+
+# Tendencias semanales desde el cubo precalculado: cada corte es una suma sobre ejes
+st.header('Tendencias Semanales')
+cube = load_trend_cube(model_mtime(TREND_CUBE_PATH))
+if not cube.keys:
+    st.info('Aún no hay cubo de tendencias; ejecuta transformación/datawarehouse.py.')
+else:
+    col1, col2, col3, col4 = st.columns(4)
+    paises = col1.multiselect('Países', options=cube.values['pais'])
+    categorias = col2.multiselect('Categorías de requerimiento', options=cube.values['categoria'])
+    niveles = col3.multiselect('Niveles de puesto', options=cube.values['nivel_puesto'])
+    semanas = col4.number_input('Semanas', min_value=2, max_value=max(2, len(cube.weeks)),
+                                value=min(TREND_WEEKS, max(2, len(cube.weeks))))
+    corte = dict(pais=paises or None, categoria=categorias or None, nivel_puesto=niveles or None)
+
+    tendencia = cube.period_over_period(**corte).tail(int(semanas))
+    st.line_chart(tendencia['trabajos'])
+    ultima = tendencia.iloc[-1]
+    st.metric('Trabajos en la última semana', int(ultima['trabajos']),
+              delta=None if pd.isna(ultima['variacion']) else int(ultima['variacion']))
+
+    eje = st.selectbox('Comparar por', options=['categoria', 'pais', 'nivel_puesto'])
+    ventana = st.slider('Semanas por periodo', min_value=1, max_value=12, value=4)
+    st.dataframe(cube.breakdown(eje, weeks=ventana, **{k: v for k, v in corte.items() if k != eje}),
+                 use_container_width=True)
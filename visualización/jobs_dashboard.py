@@ -1,137 +1,140 @@
 import streamlit as st
 import pandas as pd
 import os
-from glob import glob
-import json
-from datetime import datetime
-
-def load_jobs_data():
-    """Carga los archivos JSON de trabajos de la carpeta job_searchs"""
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, "data", "job_searchs")
-    
-    # Crear carpeta si no existe
+import sys
+import math
+
+# Permite importar los paquetes del proyecto al ejecutar el script directamente
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monitoreo.profiling import profiled
+from config.search_params import COUNTRIES
+from transformación.search_index import search
+from visualización.jobs_query import JobsQuery, SORTABLE_COLUMNS, filters_from
+
+PAGE_SIZE = 100
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "job_searchs")
+
+def search_files_signature(data_dir: str = DATA_DIR):
+    """Nombres, tamaños y fechas de modificación de las búsquedas guardadas"""
     os.makedirs(data_dir, exist_ok=True)
-    
-    files = glob(os.path.join(data_dir, "*.json"))
-    
-    if not files:
-        print(f"No se encontraron archivos JSON en: {data_dir}")
-        return pd.DataFrame()
-    
-    dfs = []
-    for file in files:
-        try:
-            df = pd.read_json(file)
-            dfs.append(df)
-        except Exception as e:
-            print(f"Error leyendo archivo {file}: {str(e)}")
-            continue
-    
-    if not dfs:
-        return pd.DataFrame()
-    
-    # Unir todos los DataFrames
-    df = pd.concat(dfs, ignore_index=True)
-    
-    # Convertir columnas de fecha
-    date_columns = ['posted', 'fecha_analisis']  # Agregar otras columnas de fecha si es necesario
-    for col in date_columns:
-        if col in df.columns:
-            try:
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-            except Exception as e:
-                print(f"Error convirtiendo columna {col} a datetime: {str(e)}")
-    
-    return df
+    return tuple(sorted(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in os.scandir(data_dir) if entry.name.endswith(".json")
+    ))
+
+# La firma de los archivos es la clave del caché: una búsqueda nueva o modificada
+# vuelve a registrar la vista (has_data y columnas como country incluidas)
+@st.cache_resource(max_entries=1)
+@profiled("jobs_dashboard.load")
+def load_jobs_query(files_signature=()):
+    """Registra en DuckDB los archivos JSON de la carpeta job_searchs, sin cargarlos en memoria"""
+    query = JobsQuery(DATA_DIR)
+    if not query.has_data:
+        print(f"No se encontraron archivos JSON en: {DATA_DIR}")
+    return query
 
 def main():
     st.set_page_config(page_title="Dashboard de Trabajos", layout="wide")
-    
+
     st.title("📊 Dashboard de Trabajos de LinkedIn")
-    
+
     # Cargar datos
-    df = load_jobs_data()
-    
-    # Filtros
+    query = load_jobs_query(search_files_signature())
+    if not query.has_data:
+        st.info("No hay búsquedas guardadas en data/job_searchs.")
+        return
+
+    # Filtros (vacío = sin filtro; las opciones se limitan a los valores más frecuentes)
     st.sidebar.header("Filtros")
-    
+
     # Filtro por ubicación
-    locations = df["location"].unique()
     selected_locations = st.sidebar.multiselect(
-        "Selecciona ubicaciones", 
-        options=locations,
-        default=locations
+        "Selecciona ubicaciones",
+        options=query.options("location")
     )
-    
+
     # Filtro por empresa
-    companies = df["company"].unique()
     selected_companies = st.sidebar.multiselect(
         "Selecciona empresas",
-        options=companies,
-        default=companies
+        options=query.options("company")
     )
-    
+
     # Filtro por fecha
-    if "posted" in df.columns:
-        min_date = df["posted"].min()
-        max_date = df["posted"].max()
-        
+    min_date, max_date = query.date_bounds()
+    date_range = []
+    if min_date is not None:
         date_range = st.sidebar.date_input(
             "Rango de fechas",
             value=[min_date, max_date],
             min_value=min_date,
             max_value=max_date
         )
-    
-    # Aplicar filtros
-    filtered_df = df[
-        (df["location"].isin(selected_locations)) &
-        (df["company"].isin(selected_companies))
-    ]
-    
-    if "posted" in df.columns:
-        filtered_df = filtered_df[
-            (filtered_df["posted"] >= pd.to_datetime(date_range[0])) &
-            (filtered_df["posted"] <= pd.to_datetime(date_range[1]))
-        ]
-    
-    # Mostrar datos
-    st.header("Trabajos Filtrados")
-    st.dataframe(filtered_df)
-    
+
+    filters = filters_from(
+        locations=selected_locations,
+        companies=selected_companies,
+        date_from=date_range[0] if len(date_range) > 0 else None,
+        date_to=date_range[1] if len(date_range) > 1 else None
+    )
+
+    # Búsqueda de texto completo sobre las descripciones
+    st.sidebar.header("Buscar en descripciones")
+    text_query = st.sidebar.text_input('Palabras clave o "frase exacta"')
+    search_countries = st.sidebar.multiselect("Países", options=list(COUNTRIES))
+    if text_query:
+        st.header(f"🔎 Resultados para: {text_query}")
+        resultados = search(
+            text_query,
+            country=search_countries or None,
+            company=selected_companies or None,
+            date_from=filters["date_from"],
+            date_to=filters["date_to"]
+        )
+        if resultados:
+            st.dataframe(pd.DataFrame(resultados).drop(columns=["score"]), use_container_width=True)
+        else:
+            st.info("No se encontraron publicaciones para esa búsqueda.")
+
     # Métricas
+    metrics = query.metrics(filters)
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Trabajos", len(filtered_df))
-    col2.metric("Empresas Únicas", filtered_df["company"].nunique())
-    col3.metric("Ubicaciones Únicas", filtered_df["location"].nunique())
-    
+    col1.metric("Total Trabajos", metrics["total"])
+    col2.metric("Empresas Únicas", metrics["companies"])
+    col3.metric("Ubicaciones Únicas", metrics["locations"])
+
+    # Mostrar datos: solo la página visible viaja al navegador
+    st.header("Trabajos Filtrados")
+    total_pages = max(1, math.ceil(metrics["total"] / PAGE_SIZE))
+    col1, col2, col3 = st.columns(3)
+    sort_by = col1.selectbox("Ordenar por", options=SORTABLE_COLUMNS)
+    ascending = col2.checkbox("Orden ascendente", value=False)
+    page = col3.number_input(f"Página (de {total_pages})", min_value=1, max_value=total_pages, value=1)
+    st.dataframe(query.page(filters, sort_by, ascending, int(page), PAGE_SIZE), use_container_width=True)
+
     # Gráficos
     st.header("Distribución de Trabajos")
-    
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
         st.subheader("Por Empresa")
-        company_counts = filtered_df["company"].value_counts()
-        st.bar_chart(company_counts)
-    
+        st.bar_chart(query.counts_by("company", filters))
+
     with col2:
-        if "posted" in filtered_df.columns:
-            st.subheader("Por Fecha")
-            date_counts = filtered_df["posted"].dt.date.value_counts().sort_index()
-            st.line_chart(date_counts)
-    
+        st.subheader("Por Fecha")
+        st.line_chart(query.counts_by_date(filters))
+
     # Exportar datos
     st.sidebar.header("Exportar Datos")
     if st.sidebar.button("Exportar a CSV"):
-        csv = filtered_df.to_csv(index=False).encode("utf-8")
         st.sidebar.download_button(
             label="Descargar CSV",
-            data=csv,
+            data=query.export_csv(filters),
             file_name="trabajos_filtrados.csv",
             mime="text/csv"
         )
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+from glob import glob
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import duckdb
+
+# Columnas por las que se permite ordenar (se interpolan en el SQL)
+SORTABLE_COLUMNS = ["posted", "title", "company", "location", "country"]
+
+
+class JobsQuery:
+    """Consultas sobre los JSON de data/job_searchs ejecutadas en DuckDB
+
+    Filtros, ordenamiento, agregaciones y paginación se resuelven en la base de
+    datos; al dashboard solo llegan la página visible y los agregados.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.conn = duckdb.connect()
+        self.has_data = bool(glob(os.path.join(data_dir, "*.json")))
+        if self.has_data:
+            pattern = os.path.join(data_dir, "*.json").replace("'", "''")
+            self.conn.execute(f"""
+                CREATE VIEW raw_jobs AS
+                SELECT * FROM read_json_auto('{pattern}', format = 'array', union_by_name = true)
+            """)
+            columns = {row[0] for row in self.conn.execute("DESCRIBE raw_jobs").fetchall()}
+            country = "country" if "country" in columns else "NULL"
+            self.conn.execute(f"""
+                CREATE VIEW jobs AS
+                SELECT title, company, location, {country} AS country,
+                       TRY_CAST(posted AS DATE) AS posted, link, source
+                FROM raw_jobs
+            """)
+
+    def _cursor(self):
+        # Un cursor por consulta: la conexión se comparte entre sesiones de Streamlit
+        return self.conn.cursor()
+
+    def _where(self, filters: Dict) -> Tuple[str, List]:
+        clauses, params = [], []
+        for column in ("location", "company", "country"):
+            values = filters.get(column)
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if filters.get("date_from"):
+            clauses.append("posted >= ?")
+            params.append(filters["date_from"])
+        if filters.get("date_to"):
+            clauses.append("posted <= ?")
+            params.append(filters["date_to"])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def options(self, column: str, limit: int = 500) -> List[str]:
+        """Valores más frecuentes de una columna, para poblar los filtros"""
+        rows = self._cursor().execute(f"""
+            SELECT {column} FROM jobs WHERE {column} IS NOT NULL
+            GROUP BY {column} ORDER BY count(*) DESC LIMIT ?
+        """, [limit]).fetchall()
+        return [row[0] for row in rows]
+
+    def date_bounds(self) -> Tuple[Optional[object], Optional[object]]:
+        return self._cursor().execute("SELECT min(posted), max(posted) FROM jobs").fetchone()
+
+    def metrics(self, filters: Dict) -> Dict[str, int]:
+        where, params = self._where(filters)
+        total, companies, locations = self._cursor().execute(f"""
+            SELECT count(*), count(DISTINCT company), count(DISTINCT location) FROM jobs {where}
+        """, params).fetchone()
+        return {"total": total, "companies": companies, "locations": locations}
+
+    def page(self, filters: Dict, sort_by: str = "posted", ascending: bool = False,
+             page: int = 1, page_size: int = 100):
+        """Solo las filas de la página pedida, ya ordenadas"""
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Columna de ordenamiento no válida: {sort_by}")
+        where, params = self._where(filters)
+        direction = "ASC" if ascending else "DESC"
+        return self._cursor().execute(f"""
+            SELECT * FROM jobs {where}
+            ORDER BY {sort_by} {direction} NULLS LAST
+            LIMIT ? OFFSET ?
+        """, params + [page_size, (page - 1) * page_size]).fetchdf()
+
+    def counts_by(self, column: str, filters: Dict, limit: int = 30):
+        where, params = self._where(filters)
+        return self._cursor().execute(f"""
+            SELECT {column}, count(*) AS trabajos FROM jobs {where}
+            GROUP BY {column} ORDER BY trabajos DESC LIMIT ?
+        """, params + [limit]).fetchdf().set_index(column)
+
+    def counts_by_date(self, filters: Dict):
+        where, params = self._where(filters)
+        where = f"{where} AND posted IS NOT NULL" if where else "WHERE posted IS NOT NULL"
+        return self._cursor().execute(f"""
+            SELECT posted, count(*) AS trabajos FROM jobs {where}
+            GROUP BY posted ORDER BY posted
+        """, params).fetchdf().set_index("posted")
+
+    def export_csv(self, filters: Dict) -> bytes:
+        """CSV del resultado filtrado, escrito por DuckDB sin pasar por un DataFrame"""
+        where, params = self._where(filters)
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            target = path.replace("'", "''")
+            self._cursor().execute(f"COPY (SELECT * FROM jobs {where}) TO '{target}' (HEADER, DELIMITER ',')", params)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+
+def filters_from(locations: Sequence[str] = (), companies: Sequence[str] = (),
+                 countries: Sequence[str] = (), date_from=None, date_to=None) -> Dict:
+    """Arma el diccionario de filtros que usan los métodos de JobsQuery"""
+    return {
+        "location": list(locations),
+        "company": list(companies),
+        "country": list(countries),
+        "date_from": date_from,
+        "date_to": date_to,
+    }